@@ -2,14 +2,16 @@
 
 import re
 from collections import Counter
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+import numpy as np
 
-from parser import Chat, Message
+from parser import Chat, ChatColumns, Message
 
 
 # Common emoji pattern
-EMOJI_PATTERN = re.compile(
+_EMOJI_CLASS = (
     "["
     "\U0001F600-\U0001F64F"  # emoticons
     "\U0001F300-\U0001F5FF"  # symbols & pictographs
@@ -20,14 +22,32 @@ EMOJI_PATTERN = re.compile(
     "\U0001FA00-\U0001FA6F"  # chess symbols
     "\U0001FA70-\U0001FAFF"  # symbols extended
     "\U00002600-\U000026FF"  # misc symbols
-    "]+",
-    flags=re.UNICODE
+    "]+"
 )
+EMOJI_PATTERN = re.compile(_EMOJI_CLASS, flags=re.UNICODE)
 
 URL_PATTERN = re.compile(r'https?://\S+')
 
+WORD_PATTERN = re.compile(r'\w+')
 
-@dataclass
+# A word ends where a URL glued onto it starts ("foohttp://x" is the word
+# "foo" and a URL), as if URLs were taken out of the text before counting
+_WORD_BEFORE_URL = rf'\w+?(?={URL_PATTERN.pattern})|\w+'
+
+# URLs are matched so they get skipped; only words land in the capture group
+WORD_OR_URL_PATTERN = re.compile(rf'{URL_PATTERN.pattern}|({_WORD_BEFORE_URL})')
+
+# URLs, emoji runs and words fused into one alternation so a message body is
+# scanned once; the matching group name tells the caller what was found
+TOKEN_PATTERN = re.compile(
+    f"(?P<url>{URL_PATTERN.pattern})|(?P<emoji>{_EMOJI_CLASS})|(?P<word>{_WORD_BEFORE_URL})"
+)
+
+# Indexed by datetime.weekday(); same names strftime('%A') gives in the C locale
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+
+@dataclass(slots=True)
 class ParticipantStats:
     """Statistics for a single participant."""
     name: str
@@ -43,6 +63,8 @@ class ParticipantStats:
     messages_by_day: dict[str, int] = field(default_factory=dict)
     messages_by_weekday: dict[str, int] = field(default_factory=dict)
     messages_by_month: dict[str, int] = field(default_factory=dict)
+    weekend_count: int = 0  # messages sent on Saturday or Sunday
+    weekday_count: int = 0  # messages sent Monday-Friday
     conversation_starts: int = 0
     avg_message_length: float = 0.0
     longest_message: Message | None = None
@@ -50,24 +72,22 @@ class ParticipantStats:
     last_message_date: datetime | None = None
     most_active_hour: int = 0
     most_active_day: str = ""
+    night_fraction: float = 0.0    # share of messages sent midnight-5am
+    morning_fraction: float = 0.0  # share of messages sent 5am-8am
 
     # Computed properties for awards
     @property
     def is_night_owl(self) -> bool:
         """Check if most active between midnight and 5am."""
-        night_messages = sum(self.messages_by_hour.get(h, 0) for h in range(0, 5))
-        total = sum(self.messages_by_hour.values())
-        return total > 0 and (night_messages / total) > 0.15
+        return self.night_fraction > 0.15
 
     @property
     def is_early_bird(self) -> bool:
         """Check if most active between 5am and 8am."""
-        morning_messages = sum(self.messages_by_hour.get(h, 0) for h in range(5, 8))
-        total = sum(self.messages_by_hour.values())
-        return total > 0 and (morning_messages / total) > 0.15
+        return self.morning_fraction > 0.15
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupStats:
     """Statistics for the entire group chat."""
     total_messages: int = 0
@@ -89,63 +109,109 @@ def extract_emojis(text: str) -> list[str]:
 
 def count_words(text: str) -> int:
     """Count words in text."""
-    # Remove URLs and count remaining words
-    text = URL_PATTERN.sub('', text)
-    words = re.findall(r'\b\w+\b', text)
-    return len(words)
+    # URL matches come back as empty captures, so they are not counted
+    tokens = WORD_OR_URL_PATTERN.findall(text)
+    return len(tokens) - tokens.count('')
+
+
+def _hours(timestamps: np.ndarray) -> list[int]:
+    """Hour of day for each datetime64 timestamp."""
+    return ((timestamps - timestamps.astype('datetime64[D]')) // np.timedelta64(1, 'h')).tolist()
+
+
+def _weekday_names(timestamps: np.ndarray) -> list[str]:
+    """Weekday name for each datetime64 timestamp (1970-01-01 was a Thursday)."""
+    weekdays = (timestamps.astype('datetime64[D]').astype(np.int64) + 3) % 7
+    return [WEEKDAY_NAMES[d] for d in weekdays.tolist()]
+
+
+def _count_by_calendar_unit(timestamps: np.ndarray, unit: str) -> Counter[str]:
+    """Count timestamps per calendar day ('D') or month ('M').
+
+    Buckets are counted on integer offsets from the epoch and only the
+    distinct ones are formatted into YYYY-MM-DD / YYYY-MM labels afterwards.
+    """
+    buckets = Counter(timestamps.astype(f'datetime64[{unit}]').astype(np.int64).tolist())
+    labels = np.datetime_as_string(np.fromiter(buckets, dtype=np.int64).astype(f'datetime64[{unit}]'))
+    return Counter(dict(zip(labels.tolist(), buckets.values())))
+
 
+def compute_participant_stats(
+    name: str,
+    messages: Sequence[Message],
+    columns: ChatColumns | None = None
+) -> ParticipantStats:
+    """Compute statistics for a single participant.
 
-def compute_participant_stats(name: str, messages: list[Message]) -> ParticipantStats:
-    """Compute statistics for a single participant."""
+    columns, if given, must be the column view of exactly these messages.
+    """
     stats = ParticipantStats(name=name)
     stats.total_messages = len(messages)
 
     if not messages:
         return stats
 
+    if columns is None:
+        columns = ChatColumns.from_messages(messages)
+    contents = columns.contents
+    timestamps = columns.timestamps
+    char_lens = list(map(len, contents))
+
+    # Words, URLs and emojis in a single tokenizing pass per message. The
+    # pattern methods are bound to locals and the tallies kept as plain ints,
+    # since this loop runs once per message
+    find_words = WORD_PATTERN.findall
+    find_words_or_urls = WORD_OR_URL_PATTERN.findall
+    find_tokens = TOKEN_PATTERN.finditer
     emoji_counter: Counter[str] = Counter()
-    messages_by_hour: Counter[int] = Counter()
-    messages_by_day: Counter[str] = Counter()
-    messages_by_weekday: Counter[str] = Counter()
-    messages_by_month: Counter[str] = Counter()
-
-    for msg in messages:
-        # Word and character counts
-        word_count = count_words(msg.content)
-        stats.total_words += word_count
-        stats.total_characters += len(msg.content)
-
-        # Media and edits
-        if msg.is_media:
-            stats.media_count += 1
-        if msg.is_edited:
-            stats.edited_count += 1
-
-        # URLs
-        urls = URL_PATTERN.findall(msg.content)
-        stats.url_count += len(urls)
-
-        # Emojis
-        emojis = extract_emojis(msg.content)
-        stats.emoji_count += len(emojis)
-        emoji_counter.update(emojis)
-
-        # Time patterns
-        messages_by_hour[msg.timestamp.hour] += 1
-        day_key = msg.timestamp.strftime('%Y-%m-%d')
-        messages_by_day[day_key] += 1
-        messages_by_weekday[msg.timestamp.strftime('%A')] += 1
-        messages_by_month[msg.timestamp.strftime('%Y-%m')] += 1
-
-        # Longest message
-        if stats.longest_message is None or len(msg.content) > len(stats.longest_message.content):
-            stats.longest_message = msg
+    word_count = url_count = emoji_count = 0
+    for content in contents:
+        if content.isascii():
+            # Pure ASCII cannot hold an emoji, so skip the emoji alternation,
+            # and without "://" there is no URL either
+            if '://' not in content:
+                word_count += len(find_words(content))
+                continue
+            tokens = find_words_or_urls(content)
+            urls = tokens.count('')
+            url_count += urls
+            word_count += len(tokens) - urls
+            continue
+        for token in find_tokens(content):
+            kind = token.lastgroup
+            if kind == 'word':
+                word_count += 1
+            elif kind == 'url':
+                url_count += 1
+            else:
+                emoji_count += 1
+                emoji_counter[token.group()] += 1
+
+    stats.total_words = word_count
+    stats.url_count = url_count
+    stats.emoji_count = emoji_count
+    stats.total_characters = sum(char_lens)
+
+    # Media and edits
+    stats.media_count = int(columns.is_media.sum())
+    stats.edited_count = int(columns.is_edited.sum())
+
+    # Time patterns
+    messages_by_hour: Counter[int] = Counter(_hours(timestamps))
+    messages_by_day: Counter[str] = _count_by_calendar_unit(timestamps, 'D')
+    messages_by_weekday: Counter[str] = Counter(_weekday_names(timestamps))
+    messages_by_month: Counter[str] = _count_by_calendar_unit(timestamps, 'M')
+
+    # Longest message (first one wins on ties)
+    stats.longest_message = messages[char_lens.index(max(char_lens))]
 
     # Store counters
     stats.messages_by_hour = dict(messages_by_hour)
     stats.messages_by_day = dict(messages_by_day)
     stats.messages_by_weekday = dict(messages_by_weekday)
     stats.messages_by_month = dict(messages_by_month)
+    stats.weekend_count = messages_by_weekday['Saturday'] + messages_by_weekday['Sunday']
+    stats.weekday_count = messages_by_weekday.total() - stats.weekend_count
 
     # Top emojis
     stats.top_emojis = emoji_counter.most_common(10)
@@ -154,17 +220,20 @@ def compute_participant_stats(name: str, messages: list[Message]) -> Participant
     stats.avg_message_length = stats.total_characters / stats.total_messages
 
     # Date range
-    sorted_msgs = sorted(messages, key=lambda m: m.timestamp)
-    stats.first_message_date = sorted_msgs[0].timestamp
-    stats.last_message_date = sorted_msgs[-1].timestamp
+    stats.first_message_date = timestamps.min().item()
+    stats.last_message_date = timestamps.max().item()
 
     # Most active hour
     if messages_by_hour:
-        stats.most_active_hour = max(messages_by_hour, key=lambda h: messages_by_hour[h])
+        stats.most_active_hour = messages_by_hour.most_common(1)[0][0]
+
+    # Time-of-day shares for the night owl / early bird awards
+    stats.night_fraction = sum(messages_by_hour[h] for h in range(0, 5)) / stats.total_messages
+    stats.morning_fraction = sum(messages_by_hour[h] for h in range(5, 8)) / stats.total_messages
 
     # Most active day
     if messages_by_day:
-        stats.most_active_day = max(messages_by_day, key=lambda d: messages_by_day[d])
+        stats.most_active_day = messages_by_day.most_common(1)[0][0]
 
     return stats
 
@@ -177,26 +246,32 @@ def compute_conversation_starts(
     Count how many times each participant started a conversation.
     A conversation start is defined as a message after a gap of gap_threshold.
     """
-    starts: Counter[str] = Counter()
-
-    sorted_messages = sorted(chat.messages, key=lambda m: m.timestamp)
-
-    for i, msg in enumerate(sorted_messages):
-        if i == 0:
-            starts[msg.sender] += 1
-            continue
-
-        prev_msg = sorted_messages[i - 1]
-        gap = msg.timestamp - prev_msg.timestamp
-
-        if gap >= gap_threshold:
-            starts[msg.sender] += 1
-
+    if not chat.messages:
+        return {}
+
+    # Vectorized gap scan over the shared columns in chronological order: the
+    # first message and every message after a long enough silence opens a
+    # conversation
+    columns = chat.columns
+    order = np.argsort(columns.timestamps, kind='stable')
+    is_start = np.empty(len(order), dtype=bool)
+    is_start[0] = True
+    np.greater_equal(np.diff(columns.timestamps[order]), np.timedelta64(gap_threshold), out=is_start[1:])
+
+    starter_ids = columns.sender_ids[order][is_start].tolist()
+    starts: Counter[str] = Counter([columns.senders[i] for i in starter_ids])
     return dict(starts)
 
 
-def compute_group_stats(chat: Chat) -> GroupStats:
-    """Compute statistics for the entire group."""
+def compute_group_stats(
+    chat: Chat,
+    participant_stats: dict[str, ParticipantStats] | None = None
+) -> GroupStats:
+    """Compute statistics for the entire group.
+
+    When participant_stats for this chat are passed in, word totals are summed
+    from them instead of tokenizing every message a second time.
+    """
     stats = GroupStats()
     stats.total_messages = len(chat.messages)
     stats.total_participants = len(chat.participants)
@@ -204,36 +279,36 @@ def compute_group_stats(chat: Chat) -> GroupStats:
     if not chat.messages:
         return stats
 
-    messages_by_hour: Counter[int] = Counter()
-    messages_by_weekday: Counter[str] = Counter()
-    messages_by_date: Counter[str] = Counter()
+    columns = chat.columns
+    timestamps = columns.timestamps
+    if participant_stats is not None:
+        stats.total_words = sum(s.total_words for s in participant_stats.values())
+    else:
+        stats.total_words = sum(map(count_words, columns.contents))
 
-    for msg in chat.messages:
-        stats.total_words += count_words(msg.content)
-        messages_by_hour[msg.timestamp.hour] += 1
-        messages_by_weekday[msg.timestamp.strftime('%A')] += 1
-        messages_by_date[msg.timestamp.strftime('%Y-%m-%d')] += 1
+    # Collect keys first and count them in one C-level Counter pass each
+    messages_by_hour: Counter[int] = Counter(_hours(timestamps))
+    messages_by_weekday: Counter[str] = Counter(_weekday_names(timestamps))
+    messages_by_date: Counter[str] = _count_by_calendar_unit(timestamps, 'D')
 
     stats.messages_by_hour = dict(messages_by_hour)
     stats.messages_by_weekday = dict(messages_by_weekday)
 
     # Date range
-    sorted_msgs = sorted(chat.messages, key=lambda m: m.timestamp)
-    stats.date_range = (sorted_msgs[0].timestamp, sorted_msgs[-1].timestamp)
+    stats.date_range = (timestamps.min().item(), timestamps.max().item())
 
     # Most active patterns
     if messages_by_hour:
-        stats.most_active_hour = max(messages_by_hour, key=lambda h: messages_by_hour[h])
+        stats.most_active_hour = messages_by_hour.most_common(1)[0][0]
     if messages_by_weekday:
-        stats.most_active_day = max(messages_by_weekday, key=lambda d: messages_by_weekday[d])
+        stats.most_active_day = messages_by_weekday.most_common(1)[0][0]
     if messages_by_date:
-        stats.busiest_date = max(messages_by_date, key=lambda d: messages_by_date[d])
-        stats.busiest_date_count = messages_by_date[stats.busiest_date]
+        stats.busiest_date, stats.busiest_date_count = messages_by_date.most_common(1)[0]
 
     return stats
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatAnalytics:
     """Complete analytics for a chat."""
     group_stats: GroupStats
@@ -282,12 +357,21 @@ class ChatAnalytics:
 
 def analyze_chat(chat: Chat) -> ChatAnalytics:
     """Perform complete analysis on a chat."""
-    group_stats = compute_group_stats(chat)
-
-    participant_stats = {}
-    for sender, messages in chat.messages_by_sender.items():
-        participant_stats[sender] = compute_participant_stats(sender, messages)
-
+    # Slice each sender's rows out of the shared columns rather than
+    # rebuilding them from Message objects
+    messages_by_sender = chat.messages_by_sender
+    columns_by_sender = {
+        sender: chat.columns.take(rows)
+        for sender, rows in chat.columns.rows_by_sender().items()
+    }
+
+    participant_stats = {
+        sender: compute_participant_stats(sender, messages, columns_by_sender[sender])
+        for sender, messages in messages_by_sender.items()
+    }
+
+    # Group totals reuse the per-participant pass rather than re-reading messages
+    group_stats = compute_group_stats(chat, participant_stats)
     conversation_starts = compute_conversation_starts(chat)
 
     # Update participant stats with conversation starts
@@ -1,13 +1,20 @@
 """Display system for Spotify Wrapped-style terminal output."""
 
 import time
+from collections.abc import Callable
+from datetime import datetime
+from functools import wraps
+from itertools import groupby
 from io import StringIO
-from rich.console import Console
+
+import numpy as np
+from rich.console import Console, Group, RenderableType
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.align import Align
+from rich.rule import Rule
 from rich.style import Style
 from rich.box import HEAVY, DOUBLE, ROUNDED, ASCII
 
@@ -18,8 +25,8 @@ from wrapped import ParticipantWrapped, GroupWrapped, Achievement
 
 console = Console()
 
-# File output console (no colors, for text file export)
-_file_console: Console | None = None
+# Whether dramatic pauses and the loading screen actually wait; see set_dramatic()
+_dramatic = True
 
 
 # Color palette (Spotify Wrapped inspired)
@@ -47,6 +54,18 @@ PARTICIPANT_COLORS = [
 # Characters for distinguishing participants in plain text output
 PARTICIPANT_CHARS = ['█', '▓', '▒', '░', '#', '=', '*', '+']
 
+# Peak-hours heatmap: a cell gets HEATMAP_PALETTE[i] where i is the number of
+# thresholds its intensity (count / max count) strictly exceeds
+HEATMAP_THRESHOLDS = (0.05, 0.2, 0.4, 0.7)
+HEATMAP_PALETTE = (" ", "░", "▒", "▓", "█")
+
+# English month names, indexed by month number - 1 (what '%B' / '%b' give)
+_MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+_MONTH_ABBR = tuple(name[:3] for name in _MONTH_NAMES)
+
 
 def get_participant_char(index: int) -> str:
     """Get a character for a participant by index (for plain text output)."""
@@ -58,8 +77,56 @@ def get_participant_color(index: int) -> str:
     return PARTICIPANT_COLORS[index % len(PARTICIPANT_COLORS)]
 
 
+def set_dramatic(on: bool) -> None:
+    """Turn dramatic pauses on or off (e.g. off when exporting to a file)."""
+    global _dramatic
+    _dramatic = on
+
+
+def _is_dramatic() -> bool:
+    """Whether pauses are worth the wait: enabled and someone is watching."""
+    return _dramatic and console.is_terminal
+
+
+def _buffered(func: Callable) -> Callable:
+    """Hold a section's console output and write it out in one go when it returns.
+
+    Rich flushes its file after every print, so this uses the console's own
+    buffer context rather than a larger stdout buffer.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with console:
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _heatmap_buckets(counts: np.ndarray, max_count: int) -> np.ndarray:
+    """Map a count matrix to HEATMAP_PALETTE indices by intensity (count / max_count)."""
+    intensity = counts / max_count
+    return np.digitize(intensity, HEATMAP_THRESHOLDS, right=True).astype(np.uint8)
+
+
+def _month_name(month_key: str, names: tuple[str, ...]) -> str | None:
+    """Look up the month of a 'YYYY-MM' key in names, or None if malformed."""
+    try:
+        month = int(month_key[5:7])
+    except ValueError:
+        return None
+    if len(month_key) != 7 or month_key[4] != '-' or not 1 <= month <= 12:
+        return None
+    return names[month - 1]
+
+
+def _format_date(dt: datetime) -> str:
+    """Format a date as 'Jan 05, 2025' (strftime '%b %d, %Y') without strftime."""
+    return f"{_MONTH_ABBR[dt.month - 1]} {dt.day:02d}, {dt.year}"
+
+
 def dramatic_pause(seconds: float = 0.5) -> None:
     """Add a dramatic pause for effect."""
+    if not _is_dramatic():
+        return
     time.sleep(seconds)
 
 
@@ -68,8 +135,33 @@ def clear_screen() -> None:
     console.clear()
 
 
+# Rendered output of static sections, keyed by section name plus the console
+# settings that affect rendering
+_static_render_cache: dict[tuple, str] = {}
+
+
+def _print_static(key: str, render: Callable[[], None]) -> None:
+    """Print a section whose output never changes, rendering it only once.
+
+    render() prints the section to `console`; its output is captured the first
+    time and written straight to the console's file on later calls.
+    """
+    cache_key = (key, console.width, console.color_system, console.is_terminal)
+    output = _static_render_cache.get(cache_key)
+    if output is None:
+        with console.capture() as capture:
+            render()
+        output = _static_render_cache[cache_key] = capture.get()
+    console.file.write(output)
+    console.file.flush()
+
+
 def print_header() -> None:
     """Print the main Wrapped header."""
+    _print_static('header', _render_header)
+
+
+def _render_header() -> None:
     header_art = """
     ░██╗░░░░░░░██╗██╗░░██╗░█████╗░████████╗░██████╗░█████╗░██████╗░██████╗░
     ░██║░░██╗░░██║██║░░██║██╔══██╗╚══██╔══╝██╔════╝██╔══██╗██╔══██╗██╔══██╗
@@ -98,36 +190,85 @@ def print_header() -> None:
     console.print()
 
 
+def _section_header_parts(title: str, color: str = COLORS['primary']) -> list[RenderableType]:
+    """Renderables for a section header: a titled rule padded by blank lines."""
+    return [Text(), Rule(f"[bold {color}]{title}[/]", style=color), Text()]
+
+
 def print_section_header(title: str, color: str = COLORS['primary']) -> None:
     """Print a section header."""
-    console.print()
-    console.rule(f"[bold {color}]{title}[/]", style=color)
-    console.print()
+    console.print(Group(*_section_header_parts(title, color)))
 
 
 def print_big_stat(label: str, value: str, color: str = COLORS['primary']) -> None:
     """Print a big statistic dramatically."""
-    console.print()
-    console.print(Align.center(Text(label, style="dim italic")))
-    dramatic_pause(0.3)
-    console.print(Align.center(Text(value, style=f"bold {color}")))
-    console.print()
+    label_text = Align.center(Text(label, style="dim italic"))
+    value_text = Align.center(Text(value, style=f"bold {color}"))
+    if _is_dramatic():
+        console.print(Group(Text(), label_text))
+        dramatic_pause(0.3)
+        console.print(Group(value_text, Text()))
+    else:
+        # Nothing to pause for, so emit the stat in one write
+        console.print(Group(Text(), label_text, value_text, Text()))
+
+
+def _achievement_parts(achievement: Achievement, color: str = COLORS['accent1']) -> list[RenderableType]:
+    """Renderables for a video-game style achievement."""
+    return [
+        f"  [{color}]{achievement.emoji}  {achievement.title}[/]",
+        f"      [dim]{achievement.description}[/]",
+        Text(),
+    ]
 
 
 def print_achievement(achievement: Achievement, color: str = COLORS['accent1']) -> None:
     """Print a video-game style achievement."""
-    console.print(f"  [{color}]{achievement.emoji}  {achievement.title}[/]")
-    console.print(f"      [dim]{achievement.description}[/]")
-    console.print()
+    console.print(Group(*_achievement_parts(achievement, color)))
 
 
-def print_quote(quote: str, color: str = COLORS['accent2']) -> None:
-    """Print a memorable quote."""
+def _quote_markup(quote: str, color: str = COLORS['accent2']) -> str:
+    """Markup for a memorable quote."""
     # Truncate very long quotes
     if len(quote) > 200:
         quote = quote[:197] + "..."
 
-    console.print(f'  [italic {color}]"{quote}"[/]')
+    return f'  [italic {color}]"{quote}"[/]'
+
+
+def print_quote(quote: str, color: str = COLORS['accent2']) -> None:
+    """Print a memorable quote."""
+    console.print(_quote_markup(quote, color))
+
+
+def _kv_text(pairs: list[tuple[str, str]], value_style: str) -> Text:
+    """Lay out label/value rows like a borderless two-column Table with (0, 2) padding.
+
+    Small fixed grids don't need Rich's table measurement, so this formats the
+    columns directly.
+    """
+    key_width = max(len(key) for key, _ in pairs)
+    value_width = max(len(value) for _, value in pairs)
+    text = Text()
+    for i, (key, value) in enumerate(pairs):
+        if i:
+            text.append("\n")
+        text.append(f"  {key:<{key_width}}  ", style="dim")
+        text.append(f"  {value:<{value_width}}  ", style=value_style)
+    return text
+
+
+def _flush_for_pause(parts: list[RenderableType], seconds: float) -> list[RenderableType]:
+    """Print the renderables built so far and pause, when pauses are on.
+
+    Returns the list to keep building on: a fresh one after a pause, or the
+    same one when there is nothing to pause for, so it goes out in one write.
+    """
+    if not _is_dramatic():
+        return parts
+    console.print(Group(*parts))
+    dramatic_pause(seconds)
+    return []
 
 
 def print_participant_wrapped(wrapped: ParticipantWrapped, index: int = 0) -> None:
@@ -137,42 +278,41 @@ def print_participant_wrapped(wrapped: ParticipantWrapped, index: int = 0) -> No
     first_name = name.split()[0]  # Use first name for labels
 
     # Big name reveal
-    console.print()
-    console.print(Align.center(Text(f"{name.upper()}'S WRAPPED", style="dim italic")))
-    dramatic_pause(0.5)
+    parts: list[RenderableType] = [
+        Text(),
+        Align.center(Text(f"{name.upper()}'S WRAPPED", style="dim italic")),
+    ]
+    parts = _flush_for_pause(parts, 0.5)
 
     name_art = f"""
     ╔{'═' * (len(name) + 4)}╗
     ║  {name.upper()}  ║
     ╚{'═' * (len(name) + 4)}╝
     """
-    console.print(Align.center(Text(name_art, style=f"bold {color}")))
+    parts.append(Align.center(Text(name_art, style=f"bold {color}")))
 
     # Tagline
     if wrapped.tagline:
-        console.print(Align.center(Text(f'"{wrapped.tagline}"', style="italic dim")))
+        parts.append(Align.center(Text(f'"{wrapped.tagline}"', style="italic dim")))
 
-    dramatic_pause(0.3)
+    parts = _flush_for_pause(parts, 0.3)
 
     # Stats grid
-    stats_table = Table(show_header=False, box=None, padding=(0, 2))
-    stats_table.add_column("stat", style="dim")
-    stats_table.add_column("value", style=f"bold {color}")
-
     stats = wrapped.stats
-    stats_table.add_row("Messages", f"{stats.total_messages:,}")
-    stats_table.add_row("Words", f"{stats.total_words:,}")
-    stats_table.add_row("Links Shared", f"{stats.url_count}")
-    stats_table.add_row("Avg Length", f"{stats.avg_message_length:.0f} chars")
+    stats_grid = _kv_text([
+        ("Messages", f"{stats.total_messages:,}"),
+        ("Words", f"{stats.total_words:,}"),
+        ("Links Shared", f"{stats.url_count}"),
+        ("Avg Length", f"{stats.avg_message_length:.0f} chars"),
+    ], f"bold {color}")
 
-    console.print()
-    console.print(Align.center(stats_table))
+    parts.extend([Text(), Align.center(stats_grid)])
 
     # Personality
     if wrapped.personality_summary:
-        console.print()
-        print_section_header(f"{first_name.upper()}'S VIBE", color)
-        console.print(Panel(
+        parts.append(Text())
+        parts.extend(_section_header_parts(f"{first_name.upper()}'S VIBE", color))
+        parts.append(Panel(
             f"[italic]{wrapped.personality_summary}[/]",
             box=ROUNDED,
             border_style=color,
@@ -181,43 +321,50 @@ def print_participant_wrapped(wrapped: ParticipantWrapped, index: int = 0) -> No
 
     # Top topics
     if wrapped.top_topics:
-        console.print()
-        print_section_header(f"{first_name.upper()} TALKED ABOUT", color)
-        for i, topic in enumerate(wrapped.top_topics, 1):
-            console.print(f"  [{color}]{i}.[/] {topic}")
+        parts.append(Text())
+        parts.extend(_section_header_parts(f"{first_name.upper()} TALKED ABOUT", color))
+        parts.append("\n".join(
+            f"  [{color}]{i}.[/] {topic}"
+            for i, topic in enumerate(wrapped.top_topics, 1)
+        ))
 
     # Memorable quotes
     if wrapped.memorable_quotes:
-        console.print()
-        print_section_header(f"{first_name.upper()}'S GREATEST HITS", color)
-        for quote in wrapped.memorable_quotes:
-            print_quote(quote, color)
-            console.print()
+        parts.append(Text())
+        parts.extend(_section_header_parts(f"{first_name.upper()}'S GREATEST HITS", color))
+        parts.append("\n\n".join(_quote_markup(quote, color) for quote in wrapped.memorable_quotes))
+        parts.append(Text())
 
     # Achievements
     if wrapped.achievements:
-        console.print()
-        print_section_header(f"{first_name.upper()}'S ACHIEVEMENTS UNLOCKED 🏆", color)
+        parts.append(Text())
+        parts.extend(_section_header_parts(f"{first_name.upper()}'S ACHIEVEMENTS UNLOCKED 🏆", color))
         for achievement in wrapped.achievements:
-            print_achievement(achievement, color)
+            parts.extend(_achievement_parts(achievement, color))
 
     # Personality archetype (from features)
     if wrapped.personality_profile:
-        print_personality_archetype(wrapped.personality_profile, color, first_name)
+        archetype, reveal = _personality_archetype_parts(wrapped.personality_profile, color, first_name)
+        parts.extend(archetype)
+        if reveal:
+            # Everything up to the celebrity match goes out before the pause
+            parts = _flush_for_pause(parts, 0.3)
+            parts.extend(reveal)
 
-    console.print()
-    console.rule(style="dim")
+    parts.extend([Text(), Rule(style="dim")])
+    console.print(Group(*parts))
 
 
+@_buffered
 def print_group_wrapped(wrapped: GroupWrapped, analytics: ChatAnalytics) -> None:
     """Print the group's Wrapped summary."""
     color = COLORS['primary']
 
-    print_section_header(f"{wrapped.chat_name.upper()} WRAPPED", color)
+    parts = _section_header_parts(f"{wrapped.chat_name.upper()} WRAPPED", color)
 
     # Summary stats
     if wrapped.summary:
-        console.print(Panel(
+        parts.append(Panel(
             f"[bold {color}]{wrapped.summary}[/]",
             box=DOUBLE,
             border_style=color,
@@ -225,9 +372,9 @@ def print_group_wrapped(wrapped: GroupWrapped, analytics: ChatAnalytics) -> None
 
     # Vibe check
     if wrapped.vibe_check:
-        console.print()
-        print_section_header("THE VIBE CHECK", COLORS['accent4'])
-        console.print(Panel(
+        parts.append(Text())
+        parts.extend(_section_header_parts("THE VIBE CHECK", COLORS['accent4']))
+        parts.append(Panel(
             f"[italic]{wrapped.vibe_check}[/]",
             box=ROUNDED,
             border_style=COLORS['accent4'],
@@ -236,8 +383,8 @@ def print_group_wrapped(wrapped: GroupWrapped, analytics: ChatAnalytics) -> None
 
     # Group stats
     gs = analytics.group_stats
-    console.print()
-    print_section_header("BY THE NUMBERS", COLORS['accent2'])
+    parts.append(Text())
+    parts.extend(_section_header_parts("BY THE NUMBERS", COLORS['accent2']))
 
     stats_table = Table(show_header=False, box=ROUNDED, border_style=COLORS['accent2'])
     stats_table.add_column("stat", style="dim")
@@ -251,22 +398,26 @@ def print_group_wrapped(wrapped: GroupWrapped, analytics: ChatAnalytics) -> None
     if gs.busiest_date:
         stats_table.add_row("Busiest Day Ever", f"{gs.busiest_date} ({gs.busiest_date_count} msgs)")
 
-    console.print(Align.center(stats_table))
+    parts.append(Align.center(stats_table))
 
     # Achievements ceremony
     if wrapped.achievements_ceremony:
-        console.print()
-        print_section_header("ACHIEVEMENTS UNLOCKED 🏆", COLORS['accent3'])
+        parts.append(Text())
+        parts.extend(_section_header_parts("ACHIEVEMENTS UNLOCKED 🏆", COLORS['accent3']))
 
         for name, achievement in wrapped.achievements_ceremony:
-            console.print(f"  [{COLORS['accent3']}]{achievement.emoji}  {achievement.title}[/] — [bold]{name}[/]")
-            console.print(f"      [dim]{achievement.description}[/]")
-            console.print()
+            parts.extend([
+                f"  [{COLORS['accent3']}]{achievement.emoji}  {achievement.title}[/] — [bold]{name}[/]",
+                f"      [dim]{achievement.description}[/]",
+                Text(),
+            ])
 
     # Topic timeline (from features)
     if wrapped.topic_timeline:
-        console.print()
-        print_topic_timeline(wrapped.topic_timeline)
+        parts.append(Text())
+        parts.extend(_topic_timeline_parts(wrapped.topic_timeline))
+
+    console.print(Group(*parts))
 
     # Top threads (from features)
     if wrapped.top_threads:
@@ -276,6 +427,9 @@ def print_group_wrapped(wrapped: GroupWrapped, analytics: ChatAnalytics) -> None
 
 def print_loading_screen() -> None:
     """Print a loading screen while processing."""
+    if not _is_dramatic():
+        return
+
     with Progress(
         SpinnerColumn(style=COLORS['primary']),
         TextColumn("[progress.description]{task.description}"),
@@ -295,6 +449,10 @@ def print_loading_screen() -> None:
 
 def print_outro() -> None:
     """Print the outro message."""
+    _print_static('outro', _render_outro)
+
+
+def _render_outro() -> None:
     console.print()
     console.print(Panel(
         "[bold]Thanks for a great year of chatting![/]\n\n"
@@ -308,6 +466,10 @@ def print_outro() -> None:
 
 def print_divider() -> None:
     """Print a visual divider."""
+    _print_static('divider', _render_divider)
+
+
+def _render_divider() -> None:
     console.print()
     console.print(Align.center(Text("* * *", style=f"dim {COLORS['accent4']}")))
     console.print()
@@ -317,38 +479,45 @@ def print_divider() -> None:
 # New Feature Display Functions
 # ============================================================================
 
-def print_topic_timeline(timeline: TopicTimeline, color: str = COLORS['accent2']) -> None:
-    """Print the topic timeline with monthly/yearly breakdown."""
-    print_section_header("YOUR YEAR IN TOPICS", color)
+def _topic_timeline_parts(timeline: TopicTimeline, color: str = COLORS['accent2']) -> list[RenderableType]:
+    """Renderables for the topic timeline with monthly/yearly breakdown."""
+    parts = _section_header_parts("YOUR YEAR IN TOPICS", color)
 
-    # Group by year for display
+    # Group by year for display. Sorting the months once (the timeline may come
+    # from a cache file) leaves the years in chronological insertion order too.
     months_by_year: dict[str, list[tuple[str, list[str]]]] = {}
-    for month_key in sorted(timeline.topics_by_month.keys()):
+    for month_key, topics in sorted(timeline.topics_by_month.items()):
         year = month_key[:4]
         if year not in months_by_year:
             months_by_year[year] = []
-        months_by_year[year].append((month_key, timeline.topics_by_month[month_key]))
-
-    for year in sorted(months_by_year.keys()):
-        console.print(f"\n[bold {color}]{year}[/]")
-        for month_key, topics in months_by_year[year]:
-            # Format month name
-            try:
-                from datetime import datetime
-                month_name = datetime.strptime(month_key, '%Y-%m').strftime('%B')
-            except:
-                month_name = month_key
+        months_by_year[year].append((month_key, topics))
+
+    lines = []
+    for year, year_months in months_by_year.items():
+        lines.append(f"\n[bold {color}]{year}[/]")
+        for month_key, topics in year_months:
+            month_name = _month_name(month_key, _MONTH_NAMES) or month_key
             topics_str = ', '.join(topics[:4])  # Show top 4 topics
-            console.print(f"  [dim]{month_name}:[/] {topics_str}")
+            lines.append(f"  [dim]{month_name}:[/] {topics_str}")
 
     # Overall top topics
     if timeline.aggregate_topics:
-        console.print()
-        console.print(f"[bold {color}]Top Topics Overall:[/]")
+        lines.append("")
+        lines.append(f"[bold {color}]Top Topics Overall:[/]")
         for i, topic in enumerate(timeline.aggregate_topics[:5], 1):
-            console.print(f"  {i}. {topic}")
+            lines.append(f"  {i}. {topic}")
+
+    if lines:
+        parts.append("\n".join(lines))
+    return parts
+
 
+def print_topic_timeline(timeline: TopicTimeline, color: str = COLORS['accent2']) -> None:
+    """Print the topic timeline with monthly/yearly breakdown."""
+    console.print(Group(*_topic_timeline_parts(timeline, color)))
 
+
+@_buffered
 def print_top_threads(threads: list[ConversationThread], color: str = COLORS['accent1']) -> None:
     """Print the top conversation threads."""
     print_section_header("TOP 5 CONVERSATIONS THIS YEAR", color)
@@ -357,7 +526,7 @@ def print_top_threads(threads: list[ConversationThread], color: str = COLORS['ac
 
     for i, thread in enumerate(threads[:5]):
         emoji = thread_emojis[i] if i < len(thread_emojis) else "💬"
-        date_str = thread.start_time.strftime('%b %d, %Y')
+        date_str = _format_date(thread.start_time)
 
         console.print(f"\n[bold {color}]#{i+1} {emoji} {date_str}[/]")
         console.print(f"   [dim]{thread.message_count} messages over {thread.duration_minutes} minutes[/]")
@@ -366,14 +535,24 @@ def print_top_threads(threads: list[ConversationThread], color: str = COLORS['ac
             console.print(f"   [italic]About:[/] {thread.topic_summary}")
 
 
-def print_personality_archetype(profile: PersonalityProfile, color: str = COLORS['accent4'], name: str = "") -> None:
-    """Print personality archetype with dramatic reveal."""
-    console.print()
+def _personality_archetype_parts(
+    profile: PersonalityProfile,
+    color: str = COLORS['accent4'],
+    name: str = "",
+) -> tuple[list[RenderableType], list[RenderableType]]:
+    """Renderables for a personality archetype reveal.
+
+    Returned in two parts, split where a dramatic pause goes before the
+    celebrity match is revealed; the second part is empty without a match.
+    """
     name_prefix = f"{name.upper()}'S" if name else "YOUR"
-    print_section_header(f"{name_prefix} ARCHETYPE: {profile.archetype.upper()} {profile.archetype_emoji}", color)
+    parts: list[RenderableType] = [Text()]
+    parts.extend(_section_header_parts(
+        f"{name_prefix} ARCHETYPE: {profile.archetype.upper()} {profile.archetype_emoji}", color
+    ))
 
     if profile.archetype_reason:
-        console.print(Panel(
+        parts.append(Panel(
             f"[italic]{profile.archetype_reason}[/]",
             box=ROUNDED,
             border_style=color,
@@ -381,36 +560,64 @@ def print_personality_archetype(profile: PersonalityProfile, color: str = COLORS
         ))
 
     # Celebrity match
+    reveal: list[RenderableType] = []
     if profile.celebrity_match:
-        console.print()
         celeb_intro = f"If {name} were a celebrity..." if name else "If you were a celebrity..."
-        console.print(Align.center(Text(celeb_intro, style="dim italic")))
-        dramatic_pause(0.3)
-        console.print(Align.center(Text(profile.celebrity_match, style=f"bold {COLORS['accent3']}")))
+        parts.extend([Text(), Align.center(Text(celeb_intro, style="dim italic"))])
+        reveal.append(Align.center(Text(profile.celebrity_match, style=f"bold {COLORS['accent3']}")))
         if profile.celebrity_reason:
-            console.print(Align.center(Text(f'"{profile.celebrity_reason}"', style="italic dim")))
+            reveal.append(Align.center(Text(f'"{profile.celebrity_reason}"', style="italic dim")))
 
     # Superpower
     if profile.superpower:
-        console.print()
         possessive = f"{name}'s" if name else "Your"
-        console.print(f"[bold {color}]{possessive} Superpower:[/] {profile.superpower}")
+        superpower = [Text(), f"[bold {color}]{possessive} Superpower:[/] {profile.superpower}"]
+        if reveal:
+            reveal.extend(superpower)
+        else:
+            parts.extend(superpower)
+
+    return parts, reveal
+
+
+def print_personality_archetype(profile: PersonalityProfile, color: str = COLORS['accent4'], name: str = "") -> None:
+    """Print personality archetype with dramatic reveal."""
+    parts, reveal = _personality_archetype_parts(profile, color, name)
+    if reveal:
+        parts = _flush_for_pause(parts, 0.3)
+        parts.extend(reveal)
+    console.print(Group(*parts))
 
 
 # ============================================================================
 # Usage Graphs
 # ============================================================================
 
+@_buffered
+def _print_row(markup: str) -> None:
+    """Print one chart row without Rich wrapping or cropping it at the console width.
+
+    A row used to be printed piece by piece, which Rich never wrapped as a
+    whole; a joined row must not break across lines mid-chart either.
+    """
+    console.print(markup, no_wrap=True, overflow="ignore", crop=False)
+
+
 def print_usage_graphs(participant_stats: dict[str, ParticipantStats], color: str = COLORS['accent2']) -> None:
     """Print ASCII bar graphs of group activity."""
-    from datetime import datetime
-
     print_section_header("GROUP ACTIVITY BREAKDOWN", color)
 
     # Get all participants
     names = list(participant_stats.keys())
-    short_names = [n.split()[0][:8] for n in names]  # First name, max 8 chars
+    all_stats = list(participant_stats.values())
+    short_names = [n.split(None, 1)[0][:8] for n in names]  # First name, max 8 chars
     max_name_len = max(len(n) for n in short_names)
+    color_prefixes = [f"[{get_participant_color(i)}]" for i in range(len(names))]
+    # Right-aligned, coloured name column shared by the weekday and hour rows
+    name_cells = [
+        f"  {prefix}{short_name:>{max_name_len}}[/] "
+        for prefix, short_name in zip(color_prefixes, short_names)
+    ]
 
     # Define bar characters
     bar_char = "█"
@@ -428,36 +635,33 @@ def print_usage_graphs(participant_stats: dict[str, ParticipantStats], color: st
     if all_months:
         sorted_months = sorted(all_months)[-12:]  # Last 12 months
 
-        # Find max for scaling
-        max_monthly = 1
-        for stats in participant_stats.values():
-            for month in sorted_months:
-                max_monthly = max(max_monthly, stats.messages_by_month.get(month, 0))
+        # Participants x months, scaled to bar lengths in one pass
+        months_arr = np.array(
+            [[stats.messages_by_month.get(month, 0) for month in sorted_months] for stats in all_stats],
+            dtype=np.int64,
+        )
+        max_monthly = max(int(months_arr.max()), 1)
 
         bar_width = 20  # Max bar width
+        bar_lens = (months_arr * bar_width) // max_monthly
+        # Every possible padded bar, indexed by length
+        month_bars = [bar_char * n + " " * (bar_width - n) for n in range(bar_width + 1)]
 
-        for month in sorted_months:
-            try:
-                month_label = datetime.strptime(month, '%Y-%m').strftime('%b %y')
-            except:
-                month_label = month
-
-            console.print(f"  [dim]{month_label:>6}[/] ", end="")
-            for i, (name, stats) in enumerate(participant_stats.items()):
-                count = stats.messages_by_month.get(month, 0)
-                bar_len = int((count / max_monthly) * bar_width) if max_monthly > 0 else 0
-                bar = bar_char * bar_len
-                p_color = get_participant_color(i)
-                console.print(f"[{p_color}]{bar:<{bar_width}}[/] ", end="")
-            console.print()
+        for j, month in enumerate(sorted_months):
+            month_abbr = _month_name(month, _MONTH_ABBR)
+            month_label = f"{month_abbr} {month[2:4]}" if month_abbr else month
+
+            row = [f"  [dim]{month_label:>6}[/] "]
+            for i, bar_len in enumerate(bar_lens[:, j].tolist()):
+                row.append(f"{color_prefixes[i]}{month_bars[bar_len]}[/] ")
+            _print_row("".join(row))
 
         # Legend
         console.print()
-        console.print("  Legend: ", end="")
+        row = ["  Legend: "]
         for i, short_name in enumerate(short_names):
-            p_color = get_participant_color(i)
-            console.print(f"[{p_color}]{bar_char}{bar_char}[/] {short_name}  ", end="")
-        console.print()
+            row.append(f"{color_prefixes[i]}{bar_char}{bar_char}[/] {short_name}  ")
+        _print_row("".join(row))
 
     # 2. Day of week activity
     console.print(f"\n[bold {color}]MOST ACTIVE DAYS[/]")
@@ -466,67 +670,55 @@ def print_usage_graphs(participant_stats: dict[str, ParticipantStats], color: st
     days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
     day_abbrevs = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
 
-    # Find max for scaling
-    max_daily = 1
-    for stats in participant_stats.values():
-        for day in days:
-            max_daily = max(max_daily, stats.messages_by_weekday.get(day, 0))
+    # Participants x weekdays, scaled to bar lengths in one pass
+    weekday_arr = np.array(
+        [[stats.messages_by_weekday.get(day, 0) for day in days] for stats in all_stats],
+        dtype=np.int64,
+    )
+    max_daily = max(int(weekday_arr.max()), 1)
 
     bar_width = 10
+    day_bar_lens = (weekday_arr * bar_width) // max_daily
+    day_bars = [bar_char * n + empty_char * (bar_width - n) for n in range(bar_width + 1)]
 
-    for i, (name, stats) in enumerate(participant_stats.items()):
-        p_color = get_participant_color(i)
-        short_name = short_names[i]
-        console.print(f"  [{p_color}]{short_name:>{max_name_len}}[/] ", end="")
-        for day in days:
-            count = stats.messages_by_weekday.get(day, 0)
-            bar_len = int((count / max_daily) * bar_width) if max_daily > 0 else 0
-            bar = bar_char * bar_len + empty_char * (bar_width - bar_len)
-            console.print(f"[{p_color}]{bar}[/]", end="")
-        console.print()
+    for i in range(len(all_stats)):
+        # One style span for the whole row of bars
+        row = [name_cells[i], color_prefixes[i]]
+        for bar_len in day_bar_lens[i].tolist():
+            row.append(day_bars[bar_len])
+        row.append("[/]")
+        _print_row("".join(row))
 
     # Day labels
-    console.print(f"  {' ' * max_name_len} ", end="")
-    for abbrev in day_abbrevs:
-        console.print(f"[dim]{abbrev:^{bar_width}}[/]", end="")
-    console.print()
+    row = [f"  {' ' * max_name_len} "]
+    row.extend(f"[dim]{abbrev:^{bar_width}}[/]" for abbrev in day_abbrevs)
+    _print_row("".join(row))
 
     # 3. Peak hours
     console.print(f"\n[bold {color}]PEAK HOURS[/]")
     console.print()
 
-    # Find max for scaling
-    max_hourly = 1
-    for stats in participant_stats.values():
-        for hour in range(24):
-            max_hourly = max(max_hourly, stats.messages_by_hour.get(hour, 0))
+    # Participants x hours, bucketed into heatmap glyphs in one pass
+    hour_arr = np.array(
+        [[stats.messages_by_hour.get(hour, 0) for hour in range(24)] for stats in all_stats],
+        dtype=np.int64,
+    )
+    max_hourly = max(int(hour_arr.max()), 1)
+    buckets = _heatmap_buckets(hour_arr, max_hourly)
 
     # Show 24 hour timeline compressed
-    for i, (name, stats) in enumerate(participant_stats.items()):
-        p_color = get_participant_color(i)
-        short_name = short_names[i]
-        console.print(f"  [{p_color}]{short_name:>{max_name_len}}[/] ", end="")
-        for hour in range(24):
-            count = stats.messages_by_hour.get(hour, 0)
-            intensity = count / max_hourly if max_hourly > 0 else 0
-            if intensity > 0.7:
-                char = "█"
-            elif intensity > 0.4:
-                char = "▓"
-            elif intensity > 0.2:
-                char = "▒"
-            elif intensity > 0.05:
-                char = "░"
-            else:
-                char = " "
-            console.print(f"[{p_color}]{char}[/]", end="")
-        console.print()
+    for i in range(len(all_stats)):
+        row = [name_cells[i], color_prefixes[i]]
+        row.extend(HEATMAP_PALETTE[bucket] for bucket in buckets[i].tolist())
+        row.append("[/]")
+        _print_row("".join(row))
 
     # Hour labels
     console.print(f"  {' ' * max_name_len} [dim]0   3   6   9   12  15  18  21  24[/]")
     console.print()
 
 
+@_buffered
 def print_archetype_cards(
     profiles_and_stats: list[tuple[str, PersonalityProfile | None, ParticipantStats]]
 ) -> None:
@@ -534,46 +726,39 @@ def print_archetype_cards(
     print_section_header("THE SQUAD", COLORS['primary'])
 
     card_width = 23
-    num_cards = len(profiles_and_stats)
+    card_inner = card_width - 2  # Between the borders
+    card_content = card_width - 4  # Between the borders and their padding
+
+    # Lines shared by every card
+    top = f"╔{'═' * card_inner}╗"
+    divider = f"╠{'═' * card_inner}╣"
+    empty = f"║{' ' * card_inner}║"
+    bottom = f"╚{'═' * card_inner}╝"
+
+    # Padding of every length a card field can need, shared by all fields
+    pads = [" " * i for i in range(card_content + 1)]
+
+    def center(text: str) -> str:
+        """Same result as text.center(card_content), using the shared pads."""
+        extra = card_content - len(text)
+        if extra <= 0:
+            return text
+        # str.center puts the odd space on the left when the width is odd
+        left = (extra >> 1) + (extra & card_content & 1)
+        return pads[left] + text + pads[extra - left]
 
     # Build card lines for each person
     all_card_lines: list[list[str]] = []
 
     for name, profile, stats in profiles_and_stats:
-        lines = []
         first_name = name.split()[0]
 
-        # Top border
-        lines.append(f"╔{'═' * (card_width - 2)}╗")
-
         # Archetype line
         if profile:
             archetype_text = f"{profile.archetype_emoji} {profile.archetype.upper()}"
         else:
             archetype_text = "? MYSTERY"
-        archetype_text = archetype_text[:card_width - 4].center(card_width - 4)
-        lines.append(f"║ {archetype_text} ║")
-
-        # Divider
-        lines.append(f"╠{'═' * (card_width - 2)}╣")
-
-        # Empty line
-        lines.append(f"║{' ' * (card_width - 2)}║")
-
-        # Name
-        name_centered = first_name.upper().center(card_width - 4)
-        lines.append(f"║ {name_centered} ║")
-
-        # Empty line
-        lines.append(f"║{' ' * (card_width - 2)}║")
-
-        # Message count
-        msg_text = f"{stats.total_messages:,} msgs"
-        msg_centered = msg_text.center(card_width - 4)
-        lines.append(f"║ {msg_centered} ║")
-
-        # Empty line
-        lines.append(f"║{' ' * (card_width - 2)}║")
+        archetype_text = center(archetype_text[:card_content])
 
         # Celebrity (truncated)
         if profile and profile.celebrity_match:
@@ -582,27 +767,32 @@ def print_archetype_cards(
             celeb = celeb.replace('**', '').strip()
             if len(celeb) > card_width - 6:
                 celeb = celeb[:card_width - 9] + "..."
-            celeb_centered = f'"{celeb}"'.center(card_width - 4)
+            celeb_centered = center(f'"{celeb}"')
         else:
-            celeb_centered = '""'.center(card_width - 4)
-        lines.append(f"║ {celeb_centered} ║")
-
-        # Empty line
-        lines.append(f"║{' ' * (card_width - 2)}║")
+            celeb_centered = center('""')
 
-        # Bottom border
-        lines.append(f"╚{'═' * (card_width - 2)}╝")
-
-        all_card_lines.append(lines)
+        msg_text = f"{stats.total_messages:,} msgs"
 
-    # Print cards side by side
-    num_lines = len(all_card_lines[0]) if all_card_lines else 0
-    for line_idx in range(num_lines):
-        line_parts = []
-        for card_idx, card_lines in enumerate(all_card_lines):
-            color = get_participant_color(card_idx)
-            line_parts.append(f"[{color}]{card_lines[line_idx]}[/]")
-        console.print("  " + "   ".join(line_parts))
+        all_card_lines.append([
+            top,
+            f"║ {archetype_text} ║",
+            divider,
+            empty,
+            f"║ {center(first_name.upper())} ║",
+            empty,
+            f"║ {center(msg_text)} ║",
+            empty,
+            f"║ {celeb_centered} ║",
+            empty,
+            bottom,
+        ])
+
+    # Print cards side by side, one colour span per card per line
+    colors = [get_participant_color(i) for i in range(len(all_card_lines))]
+    for row in zip(*all_card_lines):
+        console.print("  " + "   ".join(
+            f"[{color}]{line}[/]" for color, line in zip(colors, row)
+        ))
 
     console.print()
 
@@ -616,10 +806,16 @@ class WrappedRecorder:
 
     def __init__(self):
         self.lines: list[str] = []
+        # Bound once; the add_* methods append through this on every line
+        self._append = self.lines.append
+
+    def reset(self) -> None:
+        """Drop the recorded output so the recorder can be reused."""
+        self.lines.clear()
 
     def add_header(self) -> None:
         """Add the header to recorded output."""
-        self.lines.append(r"""
+        self._append(r"""
 ================================================================================
  __        ___   _    _  _____ ____    _    ____  ____   __        ______      _    ____  ____  _____ ____
  \ \      / / | | |  / \|_   _/ ___|  / \  |  _ \|  _ \  \ \      / /  _ \    / \  |  _ \|  _ \| ____|  _ \
@@ -633,48 +829,39 @@ class WrappedRecorder:
 
     def add_section(self, title: str) -> None:
         """Add a section header."""
-        self.lines.append("")
-        self.lines.append(f"{'=' * 80}")
-        self.lines.append(f"  {title}")
-        self.lines.append(f"{'=' * 80}")
-        self.lines.append("")
+        self.lines.extend(["", "=" * 80, f"  {title}", "=" * 80, ""])
 
     def add_subsection(self, title: str) -> None:
         """Add a subsection header."""
-        self.lines.append("")
-        self.lines.append(f"--- {title} ---")
-        self.lines.append("")
+        self.lines.extend(["", f"--- {title} ---", ""])
 
     def add_line(self, text: str = "") -> None:
         """Add a line of text."""
-        self.lines.append(text)
+        self._append(text)
 
     def add_stat(self, label: str, value: str) -> None:
         """Add a statistic line."""
-        self.lines.append(f"  {label}: {value}")
+        self._append(f"  {label}: {value}")
 
     def add_quote(self, quote: str) -> None:
-        """Add a quote."""
-        if len(quote) > 200:
-            quote = quote[:197] + "..."
-        self.lines.append(f'  "{quote}"')
+        """Add a quote, truncating very long ones."""
+        self._append(f'  "{quote}"' if len(quote) <= 200 else f'  "{quote[:197]}..."')
 
     def add_achievement(self, achievement: Achievement) -> None:
         """Add an achievement."""
-        self.lines.append(f"  {achievement.emoji}  {achievement.title}")
-        self.lines.append(f"      {achievement.description}")
-        self.lines.append("")
+        self.lines.extend([
+            f"  {achievement.emoji}  {achievement.title}",
+            f"      {achievement.description}",
+            "",
+        ])
 
     def add_divider(self) -> None:
         """Add a visual divider."""
-        self.lines.append("")
-        self.lines.append("  * * *")
-        self.lines.append("")
+        self.lines.extend(["", "  * * *", ""])
 
     def add_usage_graphs(self, participant_stats: dict[str, 'ParticipantStats']) -> None:
         """Add ASCII bar graphs of group activity for text output."""
-        from datetime import datetime
-
+        add_line = self._append  # Same as self.add_line, without the extra call
         self.add_subsection("GROUP ACTIVITY BREAKDOWN")
 
         # Get all participants
@@ -685,9 +872,19 @@ class WrappedRecorder:
         # Get character for each participant
         participant_chars = [get_participant_char(i) for i in range(len(names))]
 
+        # One (short name, chart character, stats) row per participant, shared by all
+        # charts. Participants without messages would only add empty rows, so they are
+        # dropped here; everyone keeps the character of their position in the group.
+        rows = [
+            row for row in zip(short_names, participant_chars, participant_stats.values())
+            if row[2].total_messages
+        ]
+        if not rows:
+            return
+
         # 1. Messages per month (last 12 months)
-        self.add_line("MESSAGES PER MONTH (last 12 months)")
-        self.add_line("")
+        add_line("MESSAGES PER MONTH (last 12 months)")
+        add_line("")
 
         # Collect all months across all participants
         all_months: set[str] = set()
@@ -697,134 +894,124 @@ class WrappedRecorder:
         if all_months:
             sorted_months = sorted(all_months)[-12:]  # Last 12 months
 
-            # Find max for scaling
-            max_monthly = 1
-            for stats in participant_stats.values():
-                for month in sorted_months:
-                    max_monthly = max(max_monthly, stats.messages_by_month.get(month, 0))
+            # Participants x months, scaled to bar lengths in one pass
+            months_arr = np.array(
+                [[stats.messages_by_month.get(month, 0) for month in sorted_months] for _, _, stats in rows],
+                dtype=np.int64,
+            )
+            max_monthly = max(int(months_arr.max()), 1)
 
             bar_width = 15  # Max bar width per participant
-
-            for month in sorted_months:
-                try:
-                    month_label = datetime.strptime(month, '%Y-%m').strftime('%b %y')
-                except:
-                    month_label = month
-
-                line = f"  {month_label:>6} "
-                for i, (name, stats) in enumerate(participant_stats.items()):
-                    count = stats.messages_by_month.get(month, 0)
-                    bar_len = int((count / max_monthly) * bar_width) if max_monthly > 0 else 0
-                    char = participant_chars[i]
-                    bar = char * bar_len
-                    line += f"{bar:<{bar_width}} "
-                self.add_line(line.rstrip())
+            bar_lens_by_month = ((months_arr * bar_width) // max_monthly).T.tolist()
+            # Bars of every length for each participant, and the padding
+            # (plus column separator) that follows a bar of that length
+            prebuilt = [[c * k for k in range(bar_width + 1)] for _, c, _ in rows]
+            pads = [' ' * (bar_width - k + 1) for k in range(bar_width + 1)]
+
+            for month, bar_lens in zip(sorted_months, bar_lens_by_month):
+                month_abbr = _month_name(month, _MONTH_ABBR)
+                month_label = f"{month_abbr} {month[2:4]}" if month_abbr else month
+
+                parts = ["  ", f"{month_label:>6}", " "]
+                end = 2  # Parts up to the last non-blank one; nothing after it is emitted
+                for bars, bar_len in zip(prebuilt, bar_lens):
+                    if bar_len:
+                        parts.append(bars[bar_len])
+                        end = len(parts)
+                    parts.append(pads[bar_len])
+                del parts[end:]
+                add_line(''.join(parts))
 
             # Legend
-            self.add_line("")
-            legend = "  Legend: "
-            for i, short_name in enumerate(short_names):
-                char = participant_chars[i]
-                legend += f"{char}{char} = {short_name}  "
-            self.add_line(legend.rstrip())
+            add_line("")
+            legend = "  ".join(f"{char}{char} = {short_name}" for short_name, char, _ in rows)
+            add_line(f"  Legend: {legend}")
 
         # 2. Day of week activity
-        self.add_line("")
-        self.add_line("MOST ACTIVE DAYS")
-        self.add_line("")
+        add_line("")
+        add_line("MOST ACTIVE DAYS")
+        add_line("")
 
         days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         day_abbrevs = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
 
-        # Find max for scaling
-        max_daily = 1
-        for stats in participant_stats.values():
-            for day in days:
-                max_daily = max(max_daily, stats.messages_by_weekday.get(day, 0))
+        # Participants x weekdays, scaled to bar lengths in one pass
+        weekday_arr = np.array(
+            [[stats.messages_by_weekday.get(day, 0) for day in days] for _, _, stats in rows],
+            dtype=np.int64,
+        )
+        max_daily = max(int(weekday_arr.max()), 1)
 
         bar_width = 8
-
-        for i, (name, stats) in enumerate(participant_stats.items()):
-            short_name = short_names[i]
-            char = participant_chars[i]
-            empty_char = ' '
-            line = f"  {short_name:>{max_name_len}} "
-            for day in days:
-                count = stats.messages_by_weekday.get(day, 0)
-                bar_len = int((count / max_daily) * bar_width) if max_daily > 0 else 0
-                bar = char * bar_len + empty_char * (bar_width - bar_len)
-                line += bar
-            self.add_line(line.rstrip())
+        bar_lens_by_participant = ((weekday_arr * bar_width) // max_daily).tolist()
+        empty_char = ' '
+        prebuilt = [[c * k for k in range(bar_width + 1)] for _, c, _ in rows]
+        empties = [empty_char * (bar_width - k) for k in range(bar_width + 1)]
+
+        for (short_name, _, _), bars, bar_lens in zip(rows, prebuilt, bar_lens_by_participant):
+            parts = ["  ", f"{short_name:>{max_name_len}}", " "]
+            end = 2
+            for bar_len in bar_lens:
+                if bar_len:
+                    parts.append(bars[bar_len])
+                    end = len(parts)
+                parts.append(empties[bar_len])
+            del parts[end:]
+            add_line(''.join(parts))
 
         # Day labels
-        label_line = f"  {' ' * max_name_len} "
-        for abbrev in day_abbrevs:
-            label_line += f"{abbrev:^{bar_width}}"
-        self.add_line(label_line.rstrip())
+        parts = [f"  {' ' * max_name_len} "]
+        parts.extend(f"{abbrev:^{bar_width}}" for abbrev in day_abbrevs)
+        parts[-1] = parts[-1].rstrip()
+        add_line(''.join(parts))
 
         # 3. Peak hours
-        self.add_line("")
-        self.add_line("PEAK HOURS")
-        self.add_line("")
-
-        # Find max for scaling
-        max_hourly = 1
-        for stats in participant_stats.values():
-            for hour in range(24):
-                max_hourly = max(max_hourly, stats.messages_by_hour.get(hour, 0))
+        add_line("")
+        add_line("PEAK HOURS")
+        add_line("")
+
+        # Participants x hours, bucketed like the terminal heatmap in one pass
+        hour_arr = np.array(
+            [[stats.messages_by_hour.get(hour, 0) for hour in range(24)] for _, _, stats in rows],
+            dtype=np.int64,
+        )
+        max_hourly = max(int(hour_arr.max()), 1)
+        buckets_by_participant = _heatmap_buckets(hour_arr, max_hourly).tolist()
 
         # Show 24 hour timeline compressed
-        for i, (name, stats) in enumerate(participant_stats.items()):
-            short_name = short_names[i]
-            char = participant_chars[i]
-            line = f"  {short_name:>{max_name_len}} "
-            for hour in range(24):
-                count = stats.messages_by_hour.get(hour, 0)
-                intensity = count / max_hourly if max_hourly > 0 else 0
-                if intensity > 0.7:
-                    line += char
-                elif intensity > 0.4:
-                    line += char
-                elif intensity > 0.2:
-                    line += '·'
-                elif intensity > 0.05:
-                    line += '.'
-                else:
-                    line += ' '
-            self.add_line(line.rstrip())
+        for (short_name, char, _), buckets in zip(rows, buckets_by_participant):
+            symbols = (' ', '.', '·', char, char)  # Indexed like HEATMAP_PALETTE
+            parts = ["  ", f"{short_name:>{max_name_len}}", " "]
+            end = 2
+            for bucket in buckets:
+                parts.append(symbols[bucket])
+                if bucket:
+                    end = len(parts)
+            del parts[end:]
+            add_line(''.join(parts))
 
         # Hour labels
-        self.add_line(f"  {' ' * max_name_len} 0   3   6   9   12  15  18  21  24")
-        self.add_line("")
+        add_line(f"  {' ' * max_name_len} 0   3   6   9   12  15  18  21  24")
+        add_line("")
 
     def add_topic_timeline(self, timeline: TopicTimeline) -> None:
         """Record topic timeline output."""
+        add_line = self._append  # Same as self.add_line, without the extra call
         self.add_subsection("YOUR YEAR IN TOPICS")
 
-        # Group by year
-        from datetime import datetime
-        months_by_year: dict[str, list[tuple[str, list[str]]]] = {}
-        for month_key in sorted(timeline.topics_by_month.keys()):
-            year = month_key[:4]
-            if year not in months_by_year:
-                months_by_year[year] = []
-            months_by_year[year].append((month_key, timeline.topics_by_month[month_key]))
-
-        for year in sorted(months_by_year.keys()):
-            self.add_line(f"\n{year}")
-            for month_key, topics in months_by_year[year]:
-                try:
-                    month_name = datetime.strptime(month_key, '%Y-%m').strftime('%B')
-                except:
-                    month_name = month_key
+        # Months sorted once; consecutive months of the same year form each group
+        for year, year_months in groupby(sorted(timeline.topics_by_month.items()), key=lambda item: item[0][:4]):
+            add_line(f"\n{year}")
+            for month_key, topics in year_months:
+                month_name = _month_name(month_key, _MONTH_NAMES) or month_key
                 topics_str = ', '.join(topics[:4])
-                self.add_line(f"  {month_name}: {topics_str}")
+                add_line(f"  {month_name}: {topics_str}")
 
         if timeline.aggregate_topics:
-            self.add_line("")
-            self.add_line("Top Topics Overall:")
+            add_line("")
+            add_line("Top Topics Overall:")
             for i, topic in enumerate(timeline.aggregate_topics[:5], 1):
-                self.add_line(f"  {i}. {topic}")
+                add_line(f"  {i}. {topic}")
 
     def add_top_threads(self, threads: list[ConversationThread]) -> None:
         """Record top conversation threads."""
@@ -834,7 +1021,7 @@ class WrappedRecorder:
 
         for i, thread in enumerate(threads[:5]):
             emoji = thread_emojis[i] if i < len(thread_emojis) else "[CHAT]"
-            date_str = thread.start_time.strftime('%b %d, %Y')
+            date_str = _format_date(thread.start_time)
 
             self.add_line(f"#{i+1} {emoji} {date_str}")
             self.add_line(f"   {thread.message_count} messages over {thread.duration_minutes} minutes")
@@ -913,10 +1100,12 @@ class WrappedRecorder:
 
         stats = wrapped.stats
         self.add_subsection("STATS")
-        self.add_stat("Messages", f"{stats.total_messages:,}")
-        self.add_stat("Words", f"{stats.total_words:,}")
-        self.add_stat("Links Shared", f"{stats.url_count}")
-        self.add_stat("Avg Length", f"{stats.avg_message_length:.0f} chars")
+        self.lines.extend([
+            f"  Messages: {stats.total_messages:,}",
+            f"  Words: {stats.total_words:,}",
+            f"  Links Shared: {stats.url_count}",
+            f"  Avg Length: {stats.avg_message_length:.0f} chars",
+        ])
 
         if wrapped.personality_summary:
             self.add_subsection(f"{first_name.upper()}'S VIBE")
@@ -924,8 +1113,7 @@ class WrappedRecorder:
 
         if wrapped.top_topics:
             self.add_subsection(f"{first_name.upper()} TALKED ABOUT")
-            for i, topic in enumerate(wrapped.top_topics, 1):
-                self.add_line(f"  {i}. {topic}")
+            self.lines.extend(f"  {i}. {topic}" for i, topic in enumerate(wrapped.top_topics, 1))
 
         if wrapped.memorable_quotes:
             self.add_subsection(f"{first_name.upper()}'S GREATEST HITS")
@@ -944,11 +1132,13 @@ class WrappedRecorder:
 
     def add_outro(self) -> None:
         """Add the outro."""
-        self.add_line("")
-        self.add_line("=" * 80)
-        self.add_line("  Thanks for a great year of chatting!")
-        self.add_line("  WhatsApp Wrapped 2025")
-        self.add_line("=" * 80)
+        self.lines.extend([
+            "",
+            "=" * 80,
+            "  Thanks for a great year of chatting!",
+            "  WhatsApp Wrapped 2025",
+            "=" * 80,
+        ])
 
     def get_text(self) -> str:
         """Get the recorded output as a string."""
@@ -956,8 +1146,15 @@ class WrappedRecorder:
 
     def save(self, filepath: str) -> None:
         """Save the recorded output to a file."""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(self.get_text())
+        # Stream the lines rather than building the whole text first;
+        # the file content matches get_text() exactly
+        with open(filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            write = f.write
+            lines = iter(self.lines)
+            write(next(lines, ""))
+            for line in lines:
+                write("\n")
+                write(line)
 
 
 if __name__ == '__main__':
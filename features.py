@@ -2,15 +2,39 @@
 
 import hashlib
 import json
+import math
 import random
-from collections import Counter
+import sys
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
+from itertools import islice, takewhile
 from pathlib import Path
 
+import numpy as np
+
 from lm_studio import LMStudioClient, get_client
 from parser import Chat, Message
 
+try:
+    import ahocorasick  # Optional: finds every archetype trait in a single pass
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # Optional: faster features cache (de)serialization
+except ImportError:
+    orjson = None
+
+
+# System prompts are fixed strings (never interpolated) so every request of a
+# kind shares a byte-identical prefix that LM Studio can serve from its prompt cache
+SUMMARY_SYSTEM_PROMPT = "You summarize conversations concisely. One sentence only."
+TOPICS_SYSTEM_PROMPT = "You identify conversation topics. Be specific and concise."
+PERSONALITY_SYSTEM_PROMPT = "You analyze personalities in a fun, Wrapped style. Be specific and witty."
 
 # Personality archetypes
 ARCHETYPES = {
@@ -62,6 +86,71 @@ ARCHETYPES = {
 }
 
 
+def _build_trait_automaton():
+    """Aho-Corasick automaton over all archetype traits, or None without pyahocorasick."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for info in ARCHETYPES.values():
+        for trait in info["traits"]:
+            automaton.add_word(trait, trait)
+    automaton.make_automaton()
+    return automaton
+
+
+_TRAIT_AUTOMATON = _build_trait_automaton()
+
+
+def _count_traits(texts: Iterable[str]) -> Counter[str]:
+    """Count each archetype trait across texts, with str.count's non-overlapping semantics.
+
+    Matches never span two texts.
+    """
+    if _TRAIT_AUTOMATON is None:
+        # No trait contains a newline, so none can match across the joins
+        text = '\n'.join(texts)
+        return Counter({
+            trait: text.count(trait)
+            for info in ARCHETYPES.values()
+            for trait in info["traits"]
+        })
+
+    counts: Counter[str] = Counter()
+    automaton_iter = _TRAIT_AUTOMATON.iter
+    for text in texts:
+        # Matches arrive in order of end position; a trait only counts again
+        # once its next match starts past the end of the last one it counted
+        last_end: dict[str, int] = {}
+        for end, trait in automaton_iter(text):
+            if end - len(trait) >= last_end.get(trait, -1):
+                counts[trait] += 1
+                last_end[trait] = end
+    return counts
+
+
+def _reservoir_sample(items: Iterable[Message], k: int) -> list[Message]:
+    """Uniformly sample up to k items in one pass without materialising the input.
+
+    Returns every item, in order, when there are k or fewer. Uses Algorithm L:
+    the gap to the next item that enters the reservoir is drawn directly and
+    skipped with islice, so most items cost no Python-level work or random draw.
+    """
+    it = iter(items)
+    sample: list[Message] = list(islice(it, k))
+    if len(sample) < k or k <= 0:
+        return sample
+
+    # 1 - random() is in (0, 1], so its log is always defined
+    w = math.exp(math.log(1.0 - random.random()) / k)
+    while True:
+        skip = int(math.log(1.0 - random.random()) / math.log1p(-w)) if w < 1.0 else 0
+        item = next(islice(it, min(skip, sys.maxsize), None), None)
+        if item is None:
+            return sample
+        sample[random.randrange(k)] = item
+        w *= math.exp(math.log(1.0 - random.random()) / k)
+
+
 @dataclass
 class ConversationThread:
     """A conversation thread with rapid back-and-forth."""
@@ -189,22 +278,54 @@ class ChatFeatures:
         )
 
     def save(self, filepath: str | Path) -> None:
-        """Save features to JSON file."""
+        """Save features to JSON file.
+
+        Threads and profiles are encoded and written one at a time, so the
+        full to_dict() tree is never built alongside its JSON text.
+        """
+        if orjson is not None:
+            def dumps(obj) -> str:
+                return orjson.dumps(obj).decode()
+        else:
+            def dumps(obj) -> str:
+                return json.dumps(obj, ensure_ascii=False)
+
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            f.write(f'{{\n  "chat_hash": {dumps(self.chat_hash)},\n')
+            f.write(f'  "extracted_at": {dumps(self.extracted_at.isoformat())},\n')
+            f.write(f'  "topic_timeline": {dumps(self.topic_timeline.to_dict())},\n')
+            f.write('  "top_threads": [')
+            for i, thread in enumerate(self.top_threads):
+                f.write(',\n    ' if i else '\n    ')
+                f.write(dumps(thread.to_dict()))
+            f.write('\n  ],\n  "personality_profiles": {')
+            for i, (name, profile) in enumerate(self.personality_profiles.items()):
+                f.write(',\n    ' if i else '\n    ')
+                f.write(f'{dumps(name)}: {dumps(profile.to_dict())}')
+            f.write('\n  }\n}\n')
 
     @classmethod
     def load(cls, filepath: str | Path) -> "ChatFeatures":
         """Load features from JSON file."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson is not None:
+            data = orjson.loads(Path(filepath).read_bytes())
+        else:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         return cls.from_dict(data)
 
 
 def compute_chat_hash(chat: Chat) -> str:
-    """Compute a hash of the chat for cache invalidation."""
-    content = f"{len(chat.messages)}_{chat.messages[0].timestamp}_{chat.messages[-1].timestamp}"
-    return hashlib.md5(content.encode()).hexdigest()[:12]
+    """Compute a hash of the chat's messages for cache invalidation."""
+    # Hash the column arrays' raw bytes rather than formatting every timestamp
+    columns = chat.columns
+    h = hashlib.blake2b(digest_size=6)
+    h.update(columns.timestamps.tobytes())
+    h.update(columns.sender_ids.tobytes())
+    h.update('\0'.join(columns.senders).encode())
+    for content in columns.contents:
+        h.update(f"\0{content}".encode())
+    return h.hexdigest()
 
 
 class FeatureExtractor:
@@ -214,10 +335,43 @@ class FeatureExtractor:
         self.chat = chat
         self.client = client or get_client()
 
-    def _format_messages_for_llm(self, messages: list[Message], include_sender: bool = True) -> str:
-        """Format messages for LLM input."""
+    def _map_concurrently(self, fn, items: list, on_done=None) -> list:
+        """Run fn over items on a thread pool, returning results in input order.
+
+        The calls are independent and network-bound, so up to the client's
+        max_parallel run at once and the server batches them. on_done, if
+        given, is called with each item in this thread as its call finishes.
+        """
+        if len(items) <= 1:
+            results = []
+            for item in items:
+                results.append(fn(item))
+                if on_done:
+                    on_done(item)
+            return results
+        with ThreadPoolExecutor(max_workers=min(self.client.max_parallel, len(items))) as pool:
+            futures = {pool.submit(fn, item): i for i, item in enumerate(items)}
+            results = [None] * len(items)
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                if on_done:
+                    on_done(items[i])
+            return results
+
+    def _format_messages_for_llm(
+        self,
+        messages: list[Message],
+        include_sender: bool = True,
+        limit: int = 50
+    ) -> str:
+        """Format messages for LLM input.
+
+        Only the first `limit` messages are used (to avoid token overflow);
+        callers should sample or slice down to that before calling.
+        """
         formatted = []
-        for msg in messages[:50]:  # Limit to avoid token overflow
+        for msg in messages[:limit]:
             content = msg.content[:200]
             if include_sender:
                 formatted.append(f"[{msg.sender}]: {content}")
@@ -238,30 +392,24 @@ class FeatureExtractor:
         if not self.chat.messages:
             return []
 
-        sorted_msgs = sorted(self.chat.messages, key=lambda m: m.timestamp)
-        threads: list[list[Message]] = []
-        current_thread: list[Message] = [sorted_msgs[0]]
-
-        for i in range(1, len(sorted_msgs)):
-            msg = sorted_msgs[i]
-            prev_msg = sorted_msgs[i - 1]
-            gap = (msg.timestamp - prev_msg.timestamp).total_seconds() / 60
-
-            if gap <= max_gap_minutes:
-                current_thread.append(msg)
-            else:
-                if len(current_thread) >= min_messages:
-                    threads.append(current_thread)
-                current_thread = [msg]
+        sorted_msgs = self.chat.sorted_messages
+        if sorted_msgs is self.chat.messages:
+            timestamps = self.chat.columns.timestamps
+        else:
+            timestamps = np.array([m.timestamp for m in sorted_msgs], dtype='datetime64[us]')
 
-        if len(current_thread) >= min_messages:
-            threads.append(current_thread)
+        # A thread breaks wherever the gap to the previous message is too long
+        gaps_us = np.diff(timestamps).astype(np.int64)
+        breaks = np.flatnonzero(gaps_us > max_gap_minutes * 60_000_000) + 1
+        starts = np.concatenate(([0], breaks))
+        ends = np.concatenate((breaks, [len(sorted_msgs)]))
+        keep = ends - starts >= min_messages
 
         # Score and convert threads
-        scored_threads = []
-        for thread_msgs in threads:
-            thread = self._score_thread(thread_msgs)
-            scored_threads.append(thread)
+        scored_threads = [
+            self._score_thread(sorted_msgs[start:end])
+            for start, end in zip(starts[keep].tolist(), ends[keep].tolist())
+        ]
 
         # Sort by engagement score and return top 5
         scored_threads.sort(key=lambda t: t.exchange_score, reverse=True)
@@ -269,14 +417,21 @@ class FeatureExtractor:
 
     def _score_thread(self, messages: list[Message]) -> ConversationThread:
         """Score a thread based on engagement metrics."""
-        participants = list(set(m.sender for m in messages))
         message_count = len(messages)
 
-        # Calculate back-and-forth score
+        # Gather participants, back-and-forth and length stats in one pass
+        participants_seen: dict[str, None] = {}  # insertion-ordered, unlike a set
         sender_changes = 0
-        for i in range(1, len(messages)):
-            if messages[i].sender != messages[i-1].sender:
+        total_len = 0
+        prev_sender = None
+        for m in messages:
+            sender = m.sender
+            total_len += len(m.content)
+            participants_seen[sender] = None
+            if prev_sender is not None and sender != prev_sender:
                 sender_changes += 1
+            prev_sender = sender
+        participants = list(participants_seen)
 
         # Normalize: higher score for more alternation
         max_changes = message_count - 1
@@ -285,7 +440,7 @@ class FeatureExtractor:
         # Combine factors into engagement score
         participant_factor = len(participants) / len(self.chat.participants)
         message_factor = min(message_count / 50, 1.0)  # Cap at 50 messages
-        avg_length = sum(len(m.content) for m in messages) / message_count
+        avg_length = total_len / message_count
         length_factor = min(avg_length / 100, 1.0)  # Cap at 100 chars
 
         exchange_score = (
@@ -296,8 +451,12 @@ class FeatureExtractor:
         )
 
         # Get sample messages (first few and some from middle)
-        sample = messages[:3] + messages[len(messages)//2:len(messages)//2+2]
-        sample_texts = [m.content[:100] for m in sample]
+        mid = message_count // 2
+        sample_texts = [
+            messages[i].content[:100]
+            for i in dict.fromkeys((0, 1, 2, mid, mid + 1))  # dedupes overlaps in short threads
+            if i < message_count
+        ]
 
         return ConversationThread(
             start_time=messages[0].timestamp,
@@ -310,13 +469,15 @@ class FeatureExtractor:
 
     def summarize_thread(self, thread: ConversationThread, all_messages: list[Message]) -> str:
         """Use LLM to summarize what a thread was about."""
-        # Find messages in this thread's time range
-        thread_msgs = [
-            m for m in all_messages
-            if thread.start_time <= m.timestamp <= thread.end_time
-        ]
+        # First 30 messages in this thread's time range; all_messages is sorted,
+        # so jump straight to the start instead of filtering the whole chat
+        start = bisect_left(all_messages, thread.start_time, key=lambda m: m.timestamp)
+        thread_msgs = list(islice(
+            takewhile(lambda m: m.timestamp <= thread.end_time, islice(all_messages, start, None)),
+            30,
+        ))
 
-        messages_text = self._format_messages_for_llm(thread_msgs[:30])
+        messages_text = self._format_messages_for_llm(thread_msgs, limit=30)
 
         prompt = f"""This is a conversation that had {thread.message_count} messages over {thread.duration_minutes} minutes between {', '.join(thread.participants)}.
 
@@ -329,9 +490,11 @@ One sentence summary:"""
         try:
             return self.client.generate(
                 prompt,
-                system_prompt="You summarize conversations concisely. One sentence only.",
+                system_prompt=SUMMARY_SYSTEM_PROMPT,
                 temperature=0.5,
-                max_tokens=100
+                max_tokens=100,
+                stream=True,
+                stop_at="\n"  # One sentence: stop once the model starts a second line
             ).strip()
         except Exception:
             return "An engaging discussion"
@@ -345,17 +508,29 @@ One sentence summary:"""
         timeline = TopicTimeline()
 
         # Group messages by month
-        messages_by_month: dict[str, list[Message]] = {}
+        messages_by_month: defaultdict[str, list[Message]] = defaultdict(list)
         for msg in self.chat.messages:
-            month_key = msg.timestamp.strftime('%Y-%m')
-            if month_key not in messages_by_month:
-                messages_by_month[month_key] = []
-            messages_by_month[month_key].append(msg)
-
-        # Extract topics for each month
-        for month_key in sorted(messages_by_month.keys()):
-            month_msgs = messages_by_month[month_key]
-            topics = self._extract_topics_from_messages(month_msgs, n_topics=5)
+            ts = msg.timestamp
+            messages_by_month[f'{ts.year:04d}-{ts.month:02d}'].append(msg)
+
+        # Extract topics for each month, sending every month's prompt as one batch
+        prompts = {
+            month_key: self._topics_prompt(messages_by_month[month_key], n_topics=5)
+            for month_key in sorted(messages_by_month.keys())
+        }
+        batch = [month_key for month_key, prompt in prompts.items() if prompt is not None]
+        responses = dict(zip(batch, self.client.generate_batch(
+            [prompts[month_key] for month_key in batch],
+            system_prompt=TOPICS_SYSTEM_PROMPT,
+            temperature=0.5,
+        )))
+        for month_key, prompt in prompts.items():
+            if prompt is None:
+                topics = ["General chat"]
+            elif isinstance(responses[month_key], Exception):
+                topics = ["General discussion"]
+            else:
+                topics = self._parse_topics(responses[month_key], n_topics=5)
             timeline.topics_by_month[month_key] = topics
 
         # Aggregate by year
@@ -381,45 +556,33 @@ One sentence summary:"""
 
         return timeline
 
-    def _extract_topics_from_messages(
-        self,
-        messages: list[Message],
-        n_topics: int = 5
-    ) -> list[str]:
-        """Extract topics from a set of messages using LLM."""
+    def _topics_prompt(self, messages: list[Message], n_topics: int = 5) -> str | None:
+        """Build the topic-extraction prompt for a set of messages, or None if none are usable."""
         # Sample messages
-        good_messages = [m for m in messages if not m.is_media and len(m.content) > 20]
-        if len(good_messages) > 40:
-            sample = random.sample(good_messages, 40)
-        else:
-            sample = good_messages
+        sample = _reservoir_sample(
+            (m for m in messages if not m.is_media and len(m.content) > 20), 40
+        )
 
         if not sample:
-            return ["General chat"]
+            return None
 
         messages_text = self._format_messages_for_llm(sample, include_sender=False)
 
-        prompt = f"""Based on these chat messages, identify the {n_topics} main topics discussed.
+        return f"""Based on these chat messages, identify the {n_topics} main topics discussed.
 
 Messages:
 {messages_text}
 
 List exactly {n_topics} topics, one per line (short, 2-4 words each):"""
 
-        try:
-            response = self.client.generate(
-                prompt,
-                system_prompt="You identify conversation topics. Be specific and concise.",
-                temperature=0.5
-            )
-            topics = [
-                line.strip().strip('-').strip('0123456789.').strip()
-                for line in response.strip().split('\n')
-                if line.strip()
-            ]
-            return topics[:n_topics]
-        except Exception:
-            return ["General discussion"]
+    def _parse_topics(self, response: str, n_topics: int = 5) -> list[str]:
+        """Parse a one-topic-per-line LLM response."""
+        topics = [
+            line.strip().strip('-').strip('0123456789.').strip()
+            for line in response.strip().split('\n')
+            if line.strip()
+        ]
+        return topics[:n_topics]
 
     # =========================================================================
     # Personality Archetype Detection
@@ -427,7 +590,7 @@ List exactly {n_topics} topics, one per line (short, 2-4 words each):"""
 
     def extract_personality_profile(self, name: str) -> PersonalityProfile:
         """Extract personality profile for a participant."""
-        messages = self.chat.messages_by_sender.get(name, [])
+        messages = self.chat.messages_by_sender.get(name, ())
         if not messages:
             return PersonalityProfile(name=name, archetype="The Mystery")
 
@@ -459,7 +622,7 @@ SUPERPOWER: [superpower]"""
         try:
             response = self.client.generate(
                 prompt,
-                system_prompt="You analyze personalities in a fun, Wrapped style. Be specific and witty.",
+                system_prompt=PERSONALITY_SYSTEM_PROMPT,
                 temperature=0.8
             )
 
@@ -483,18 +646,16 @@ SUPERPOWER: [superpower]"""
 
     def _detect_archetype(self, messages: list[Message]) -> tuple[str, str]:
         """Detect archetype based on message patterns."""
-        all_content = ' '.join(m.content.lower() for m in messages)
-        msg_lengths = [len(m.content) for m in messages]
-        avg_length = sum(msg_lengths) / len(msg_lengths) if msg_lengths else 0
+        avg_length = sum(len(m.content) for m in messages) / len(messages) if messages else 0
 
         # Score each archetype
         scores: dict[str, float] = {}
+        trait_counts = _count_traits(m.content.lower() for m in messages)
 
         for archetype, info in ARCHETYPES.items():
             score = 0
             for trait in info["traits"]:
-                count = all_content.count(trait)
-                score += count
+                score += trait_counts[trait]
 
             # Special detection for Storyteller (long messages)
             if archetype == "The Storyteller" and avg_length > 80:
@@ -524,11 +685,20 @@ SUPERPOWER: [superpower]"""
         threads = self.find_conversation_threads()
 
         # Summarize top threads
-        sorted_msgs = sorted(self.chat.messages, key=lambda m: m.timestamp)
-        for thread in threads:
-            if progress_callback:
-                progress_callback(f"Analyzing conversation from {thread.start_time.strftime('%b %d')}...")
-            thread.topic_summary = self.summarize_thread(thread, sorted_msgs)
+        sorted_msgs = self.chat.sorted_messages
+        thread_done = None
+        if progress_callback:
+            progress_callback("Summarizing conversations...")
+
+            def thread_done(thread):
+                progress_callback(f"Analyzed conversation from {thread.start_time.strftime('%b %d')}")
+        # Dispatch similar-length prompts together so the server's batches need less padding
+        by_length = sorted(threads, key=lambda t: t.message_count)
+        summaries = self._map_concurrently(
+            lambda thread: self.summarize_thread(thread, sorted_msgs), by_length, on_done=thread_done
+        )
+        for thread, summary in zip(by_length, summaries):
+            thread.topic_summary = summary
 
         # Step 2: Extract topic timeline
         if progress_callback:
@@ -536,11 +706,19 @@ SUPERPOWER: [superpower]"""
         topic_timeline = self.extract_topic_timeline()
 
         # Step 3: Extract personality profiles
-        personality_profiles = {}
-        for name in self.chat.participants:
-            if progress_callback:
-                progress_callback(f"Analyzing {name}'s personality...")
-            personality_profiles[name] = self.extract_personality_profile(name)
+        names = list(self.chat.participants)
+        profile_done = None
+        if progress_callback:
+            progress_callback("Analyzing personalities...")
+
+            def profile_done(name):
+                progress_callback(f"Analyzed {name}'s personality")
+        by_length = sorted(names, key=lambda name: len(self.chat.messages_by_sender.get(name, ())))
+        profiles = dict(zip(
+            by_length,
+            self._map_concurrently(self.extract_personality_profile, by_length, on_done=profile_done)
+        ))
+        personality_profiles = {name: profiles[name] for name in names}
 
         return ChatFeatures(
             chat_hash=chat_hash,
@@ -591,7 +769,6 @@ def load_or_extract_features(
 
 
 if __name__ == '__main__':
-    import sys
     from parser import parse_chat
 
     if len(sys.argv) < 2:
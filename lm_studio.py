@@ -1,8 +1,27 @@
 """LM Studio API client for embeddings and chat completions."""
 
-import requests
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Chat completions in flight at once, across every caller sharing a client;
+# override with the LMSTUDIO_NUM_PARALLEL environment variable
+DEFAULT_MAX_PARALLEL = 8
+
+
+class RequestCancelled(RuntimeError):
+    """Raised for an LLM request made after the client's cancel event was set."""
+
 
 class LMStudioClient:
     """Client for interacting with LM Studio's OpenAI-compatible API."""
@@ -12,22 +31,128 @@ class LMStudioClient:
         base_url: str = "http://127.0.0.1:1234/v1",
         embedding_model: str = "text-embedding-nomic-embed-text-v1.5",
         chat_model: str = "openai/gpt-oss-20b",
-        timeout: int = 120
+        timeout: int = 120,
+        cache_path: str | Path | None = ".llm_cache.sqlite",
+        draft_model: str | None = None,
+        max_parallel: int | None = None,
+        cancel_event: threading.Event | None = None
     ):
         self.base_url = base_url.rstrip('/')
         self.embedding_model = embedding_model
         self.chat_model = chat_model
         self.timeout = timeout
+        # Small model LM Studio uses for speculative decoding on request
+        self.draft_model = draft_model
+
+        # Cap on concurrent chat completions. Callers may run as many threads
+        # as they like; requests beyond the cap wait for a free slot. Set it to
+        # the server's parallel slots: higher lowers latency until requests
+        # just queue on the server, lower leaves the GPU idle between requests
+        if max_parallel is None:
+            max_parallel = int(os.environ.get("LMSTUDIO_NUM_PARALLEL", DEFAULT_MAX_PARALLEL))
+        self.max_parallel = max(1, max_parallel)
+        self._slots = threading.BoundedSemaphore(self.max_parallel)
+
+        # Once set, new requests raise RequestCancelled and streamed ones stop
+        # at the next chunk, so work queued in thread pools drains at once
+        # after Ctrl-C; non-streamed requests already sent still finish
+        self.cancel_event = cancel_event if cancel_event is not None else threading.Event()
+
+        # One keep-alive connection pool shared by every request, sized for
+        # concurrent feature extraction; connection failures are retried
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=max(16, self.max_parallel),
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Completion cache keyed by request hash; opened on first use
+        self.cache_path = cache_path
+        self._cache: sqlite3.Connection | None = None
+        self._cache_lock = threading.Lock()
+
+    def _cache_connection(self) -> sqlite3.Connection:
+        """Open the completion cache, creating its table if needed (call with the lock held)."""
+        if self._cache is None:
+            conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS completions (key BLOB PRIMARY KEY, response TEXT)")
+            self._cache = conn
+        return self._cache
+
+    def _cache_get(self, key: bytes) -> str | None:
+        """Look up a cached completion."""
+        with self._cache_lock:
+            row = self._cache_connection().execute(
+                "SELECT response FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _cache_put(self, key: bytes, response: str) -> None:
+        """Store a completion in the cache."""
+        with self._cache_lock:
+            conn = self._cache_connection()
+            conn.execute("INSERT OR IGNORE INTO completions (key, response) VALUES (?, ?)", (key, response))
+            conn.commit()
+
+    def _check_cancelled(self) -> None:
+        """Raise RequestCancelled if the client's cancel event is set."""
+        if self.cancel_event.is_set():
+            raise RequestCancelled("LLM request cancelled")
 
     def _post(self, endpoint: str, data: dict[str, Any]) -> dict[str, Any]:
         """Make a POST request to LM Studio."""
+        self._check_cancelled()
         url = f"{self.base_url}/{endpoint}"
-        headers = {"Content-Type": "application/json"}
 
-        response = requests.post(url, json=data, headers=headers, timeout=self.timeout)
+        response = self.session.post(url, json=data, timeout=self.timeout)
         response.raise_for_status()
         return response.json()
 
+    def _stream_chat(self, data: dict[str, Any], stop_at: str | None = None) -> str:
+        """Stream a chat completion over SSE, accumulating the content deltas.
+
+        If stop_at is given, reading stops as soon as it appears after some
+        non-whitespace text, and the text is cut just after it; closing the
+        response early tells LM Studio to stop generating.
+        """
+        self._check_cancelled()
+        url = f"{self.base_url}/chat/completions"
+        content = ""
+        lead = None  # index of the first non-whitespace character, once seen
+
+        with self.session.post(url, json=data, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            # SSE is always UTF-8, but text/event-stream names no charset, so
+            # requests would otherwise decode it as ISO-8859-1
+            response.encoding = 'utf-8'
+            for line in response.iter_lines(decode_unicode=True):
+                self._check_cancelled()
+                if not line or not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                choices = json.loads(payload).get("choices")
+                delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                if not delta:
+                    continue
+                start = max(0, len(content) - len(stop_at) + 1) if stop_at else 0
+                content += delta
+                if stop_at:
+                    if lead is None and not content.isspace():
+                        lead = len(content) - len(content.lstrip())
+                    if lead is not None:
+                        end = content.find(stop_at, max(start, lead))
+                        if end != -1:
+                            return content[:end + len(stop_at)]
+
+        return content
+
     def get_embedding(self, text: str) -> list[float]:
         """Get embedding vector for a single text."""
         data = {
@@ -38,12 +163,14 @@ class LMStudioClient:
         result = self._post("embeddings", data)
         return result["data"][0]["embedding"]
 
-    def get_embeddings_batch(self, texts: list[str], batch_size: int = 32) -> list[list[float]]:
-        """Get embedding vectors for multiple texts in batches."""
-        all_embeddings: list[list[float]] = []
-
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
+    def get_embeddings_batch(
+        self,
+        texts: list[str],
+        batch_size: int = 128,
+        max_workers: int = 8
+    ) -> list[list[float]]:
+        """Get embedding vectors for multiple texts in batches, sending up to max_workers batches at once."""
+        def embed(batch: list[str]) -> list[list[float]]:
             data = {
                 "model": self.embedding_model,
                 "input": batch
@@ -52,9 +179,18 @@ class LMStudioClient:
             result = self._post("embeddings", data)
             # Sort by index to maintain order
             sorted_data = sorted(result["data"], key=lambda x: x["index"])
-            embeddings = [item["embedding"] for item in sorted_data]
-            all_embeddings.extend(embeddings)
+            return [item["embedding"] for item in sorted_data]
+
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        if len(batches) <= 1:
+            batch_embeddings = [embed(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+                batch_embeddings = list(pool.map(embed, batches))
 
+        all_embeddings: list[list[float]] = []
+        for embeddings in batch_embeddings:
+            all_embeddings.extend(embeddings)
         return all_embeddings
 
     def chat_completion(
@@ -62,9 +198,19 @@ class LMStudioClient:
         messages: list[dict[str, str]],
         temperature: float = 0.7,
         max_tokens: int = -1,
-        stream: bool = False
+        stream: bool = False,
+        stop_at: str | None = None,
+        response_format: dict[str, Any] | None = None,
+        speculative: bool = False
     ) -> str:
-        """Generate a chat completion."""
+        """Generate a chat completion, reusing the cached response for an identical request.
+
+        With stream=True the response is read as it is generated, and stop_at
+        can end it early (see _stream_chat). response_format is passed to LM
+        Studio as-is, e.g. a json_schema to constrain the output. speculative
+        drafts tokens with the client's draft_model, if it has one; this
+        speeds up short completions without changing what is generated.
+        """
         data = {
             "model": self.chat_model,
             "messages": messages,
@@ -72,16 +218,39 @@ class LMStudioClient:
             "max_tokens": max_tokens,
             "stream": stream
         }
+        if response_format is not None:
+            data["response_format"] = response_format
+        if speculative and self.draft_model:
+            data["draft_model"] = self.draft_model
 
-        result = self._post("chat/completions", data)
-        return result["choices"][0]["message"]["content"]
+        key = None
+        if self.cache_path is not None:
+            key_data = data if stop_at is None else {**data, "stop_at": stop_at}
+            key = hashlib.blake2b(json.dumps(key_data, sort_keys=True).encode(), digest_size=16).digest()
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
+        with self._slots:
+            if stream:
+                content = self._stream_chat(data, stop_at)
+            else:
+                result = self._post("chat/completions", data)
+                content = result["choices"][0]["message"]["content"]
+        if key is not None:
+            self._cache_put(key, content)
+        return content
 
     def generate(
         self,
         prompt: str,
         system_prompt: str | None = None,
         temperature: float = 0.7,
-        max_tokens: int = -1
+        max_tokens: int = -1,
+        stream: bool = False,
+        stop_at: str | None = None,
+        response_format: dict[str, Any] | None = None,
+        speculative: bool = False
     ) -> str:
         """Simple generation with optional system prompt."""
         messages = []
@@ -89,12 +258,46 @@ class LMStudioClient:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
-        return self.chat_completion(messages, temperature, max_tokens)
+        return self.chat_completion(
+            messages, temperature, max_tokens, stream, stop_at, response_format, speculative
+        )
+
+    def generate_batch(
+        self,
+        prompts: list[str],
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = -1,
+        max_workers: int | None = None,
+        speculative: bool = False
+    ) -> list[str | Exception]:
+        """Generate completions for several prompts concurrently.
+
+        LM Studio batches concurrent requests, so this is much faster than
+        calling generate() in a loop. Results come back in prompt order; a
+        failed prompt yields its exception instead of a string, so one bad
+        request doesn't lose the others. max_workers defaults to max_parallel.
+        """
+        if max_workers is None:
+            max_workers = self.max_parallel
+
+        def run(prompt: str) -> str | Exception:
+            try:
+                return self.generate(
+                    prompt, system_prompt, temperature, max_tokens, speculative=speculative
+                )
+            except Exception as e:
+                return e
+
+        if len(prompts) <= 1:
+            return [run(prompt) for prompt in prompts]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as pool:
+            return list(pool.map(run, prompts))
 
     def is_available(self) -> bool:
         """Check if LM Studio server is available."""
         try:
-            response = requests.get(f"{self.base_url}/models", timeout=5)
+            response = self.session.get(f"{self.base_url}/models", timeout=5)
             return response.status_code == 200
         except requests.exceptions.RequestException:
             return False
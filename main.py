@@ -3,7 +3,10 @@
 
 import argparse
 import re
+import signal
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -25,11 +28,16 @@ from display import (
     print_usage_graphs,
     print_archetype_cards,
     dramatic_pause,
+    set_dramatic,
     COLORS,
     WrappedRecorder,
 )
 
 
+# Participants whose Wrapped is generated at once; each makes several LLM calls
+PARTICIPANT_WORKERS = 4
+
+
 def check_lm_studio(client: LMStudioClient) -> bool:
     """Check if LM Studio is available."""
     if not client.is_available():
@@ -51,12 +59,30 @@ def run_wrapped(
     output_file: Path | None = None,
     rebuild_index: bool = False,
     index_only: bool = False,
-    chat_model: str = "openai/gpt-oss-20b"
+    chat_model: str = "openai/gpt-oss-20b",
+    llm_cache: bool = True,
+    draft_model: str | None = None,
+    base_url: str = "http://127.0.0.1:1234/v1",
+    llm_personality: bool = True,
+    cancel_event: threading.Event | None = None
 ) -> None:
-    """Run the full Wrapped generation pipeline."""
+    """Run the full Wrapped generation pipeline.
 
-    # Initialize LM Studio client
-    client = LMStudioClient(chat_model=chat_model)
+    Setting cancel_event makes every LLM request not yet sent fail at once.
+    """
+
+    # Initialize LM Studio client; identical LLM requests are answered from
+    # the on-disk completion cache unless it is turned off
+    if llm_cache:
+        client = LMStudioClient(
+            base_url=base_url, chat_model=chat_model, draft_model=draft_model,
+            cancel_event=cancel_event
+        )
+    else:
+        client = LMStudioClient(
+            base_url=base_url, chat_model=chat_model, cache_path=None, draft_model=draft_model,
+            cancel_event=cancel_event
+        )
 
     # Check LM Studio availability
     if not check_lm_studio(client):
@@ -111,10 +137,14 @@ def run_wrapped(
             return
 
     # Initialize generator with features
-    generator = WrappedGenerator(chat, analytics, client, features=features)
+    generator = WrappedGenerator(
+        chat, analytics, client, features=features, use_llm_personality=llm_personality
+    )
 
-    # Initialize recorder for file output
+    # Initialize recorder for file output; no need to stage pauses for it
     recorder = WrappedRecorder() if output_file else None
+    if recorder:
+        set_dramatic(False)
 
     # Print header
     print_header()
@@ -150,28 +180,48 @@ def run_wrapped(
     # Generate individual wrappeds
     participant_wrappeds = []
     if not skip_individuals:
-        for i, participant in enumerate(chat.participants):
-            with Progress(
-                SpinnerColumn(style=COLORS['primary']),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-                transient=True,
-            ) as progress:
-                task = progress.add_task(f"[bold]Generating {participant}'s Wrapped...", total=None)
-                participant_wrapped = generator.generate_participant_wrapped(participant)
-                progress.update(task, description=f"[bold]{participant}'s Wrapped ready!")
-                dramatic_pause(0.2)
-
-            participant_wrappeds.append(participant_wrapped)
-            print_participant_wrapped(participant_wrapped, i)
-            if recorder:
-                recorder.add_participant_wrapped(participant_wrapped)
-
-            if i < len(chat.participants) - 1:
-                print_divider()
+        # Quick mode asks for each participant's Wrapped in a single LLM call
+        generate = (
+            generator.generate_participant_wrapped_batched if quick_mode
+            else generator.generate_participant_wrapped
+        )
+
+        # Generate in the background, several participants at a time, but show
+        # each one in participant order as soon as it is ready. On Ctrl-C or an
+        # error, queued participants are cancelled; running ones still finish
+        # before exit, but after Ctrl-C their unsent LLM requests fail at once
+        pool = ThreadPoolExecutor(max_workers=PARTICIPANT_WORKERS)
+        finished = False
+        try:
+            futures = [
+                pool.submit(generate, participant)
+                for participant in chat.participants
+            ]
+            for i, (participant, future) in enumerate(zip(chat.participants, futures)):
+                with Progress(
+                    SpinnerColumn(style=COLORS['primary']),
+                    TextColumn("[progress.description]{task.description}"),
+                    console=console,
+                    transient=True,
+                ) as progress:
+                    task = progress.add_task(f"[bold]Generating {participant}'s Wrapped...", total=None)
+                    participant_wrapped = future.result()
+                    progress.update(task, description=f"[bold]{participant}'s Wrapped ready!")
+                    dramatic_pause(0.2)
+
+                participant_wrappeds.append(participant_wrapped)
+                print_participant_wrapped(participant_wrapped, i)
                 if recorder:
-                    recorder.add_divider()
-                dramatic_pause(0.3)
+                    recorder.add_participant_wrapped(participant_wrapped)
+
+                if i < len(chat.participants) - 1:
+                    print_divider()
+                    if recorder:
+                        recorder.add_divider()
+                    dramatic_pause(0.3)
+            finished = True
+        finally:
+            pool.shutdown(wait=finished, cancel_futures=not finished)
 
         # Show all archetypes side-by-side at the end
         profiles_and_stats = [
@@ -205,6 +255,10 @@ Examples:
   python main.py chat.txt --name "Dortmunders Wrapped 2025" -o  # Auto-generate filename from name
   python main.py chat.txt --rebuild-index  # Force fresh feature extraction
   python main.py chat.txt --index-only  # Just build index, don't display
+  python main.py chat.txt --no-llm-cache  # Fresh LLM responses, ignore cached ones
+  python main.py chat.txt --draft-model qwen/qwen3-0.6b  # Speculative decoding for short outputs
+  python main.py chat.txt --base-url http://gpu-box:8000/v1  # Any OpenAI-compatible server, e.g. vLLM
+  python main.py chat.txt --no-llm-personality  # Template personality summaries from the features
 
 Requirements:
   LM Studio must be running at http://127.0.0.1:1234 with:
@@ -269,6 +323,31 @@ Available chat models:
         ],
         help="LLM model to use for chat completions (default: openai/gpt-oss-20b)"
     )
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Don't reuse or store LLM responses in the on-disk completion cache"
+    )
+    parser.add_argument(
+        "--draft-model",
+        type=str,
+        default=None,
+        help="Small model, from the same family as the chat model, for LM Studio to use as a "
+             "speculative-decoding draft on short outputs (taglines, achievements)"
+    )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default="http://127.0.0.1:1234/v1",
+        help="OpenAI-compatible API to send requests to (default: LM Studio at http://127.0.0.1:1234/v1). "
+             "A vLLM server batches the many concurrent Wrapped requests continuously"
+    )
+    parser.add_argument(
+        "--no-llm-personality",
+        action="store_true",
+        help="Template personality summaries from the extracted archetype profiles instead of "
+             "asking the LLM: one fewer LLM call per participant, but less specific summaries"
+    )
 
     args = parser.parse_args()
 
@@ -300,6 +379,17 @@ Available chat models:
         timestamp = datetime.now().strftime('%m-%d--%H-%M')
         output_file = Path(f"{name_slug}-{timestamp}.txt")
 
+    # Ctrl-C cancels pending LLM requests before KeyboardInterrupt unwinds, so
+    # thread pools waiting on their workers on the way out are not kept
+    # waiting for requests that have not been sent yet
+    cancelled = threading.Event()
+
+    def interrupt(signum, frame):
+        cancelled.set()
+        signal.default_int_handler(signum, frame)
+
+    signal.signal(signal.SIGINT, interrupt)
+
     try:
         run_wrapped(
             chat_file=args.chat_file,
@@ -309,7 +399,12 @@ Available chat models:
             output_file=output_file,
             rebuild_index=args.rebuild_index,
             index_only=args.index_only,
-            chat_model=args.chat_model
+            chat_model=args.chat_model,
+            llm_cache=not args.no_llm_cache,
+            draft_model=args.draft_model,
+            base_url=args.base_url,
+            llm_personality=not args.no_llm_personality,
+            cancel_event=cancelled
         )
     except KeyboardInterrupt:
         console.print("\n[dim]Wrapped generation cancelled.[/]")
@@ -1,12 +1,19 @@
 """WhatsApp chat export parser."""
 
+import mmap
 import re
+import sys
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property, lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class Message:
     """Represents a single WhatsApp message."""
     timestamp: datetime
@@ -24,33 +31,99 @@ class Message:
         return text.strip()
 
 
+@dataclass(slots=True)
+class ChatColumns:
+    """Column-oriented (struct-of-arrays) view of a list of messages."""
+    contents: list[str]
+    timestamps: np.ndarray  # datetime64[us]
+    senders: list[str]      # distinct senders, in order of first appearance
+    sender_ids: np.ndarray  # int32 index into senders, one per message
+    is_media: np.ndarray    # bool
+    is_edited: np.ndarray   # bool
+
+    @classmethod
+    def from_messages(cls, messages: list[Message]) -> "ChatColumns":
+        """Build the columns from messages, preserving their order."""
+        sender_index: dict[str, int] = {}
+        sender_ids = [sender_index.setdefault(m.sender, len(sender_index)) for m in messages]
+        return cls(
+            contents=[m.content for m in messages],
+            timestamps=np.array([m.timestamp for m in messages], dtype='datetime64[us]'),
+            senders=list(sender_index),
+            sender_ids=np.array(sender_ids, dtype=np.int32),
+            is_media=np.array([m.is_media for m in messages], dtype=bool),
+            is_edited=np.array([m.is_edited for m in messages], dtype=bool),
+        )
+
+    def take(self, rows: np.ndarray) -> "ChatColumns":
+        """Return the columns for the given row indices only."""
+        ids = self.sender_ids[rows]
+        used = np.unique(ids)
+        remap = np.zeros(len(self.senders), dtype=np.int32)
+        remap[used] = np.arange(len(used), dtype=np.int32)
+        return ChatColumns(
+            contents=[self.contents[i] for i in rows.tolist()],
+            timestamps=self.timestamps[rows],
+            senders=[self.senders[i] for i in used.tolist()],
+            sender_ids=remap[ids],
+            is_media=self.is_media[rows],
+            is_edited=self.is_edited[rows],
+        )
+
+    def rows_by_sender(self) -> dict[str, np.ndarray]:
+        """Row indices of each sender's messages, keyed by sender."""
+        order = np.argsort(self.sender_ids, kind='stable')
+        counts = np.bincount(self.sender_ids, minlength=len(self.senders))
+        return dict(zip(self.senders, np.split(order, np.cumsum(counts)[:-1])))
+
+
 @dataclass
 class Chat:
     """Represents a parsed WhatsApp chat."""
     messages: list[Message]
     participants: list[str]
 
-    @property
-    def messages_by_sender(self) -> dict[str, list[Message]]:
-        """Group messages by sender."""
+    @cached_property
+    def columns(self) -> ChatColumns:
+        """Shared column view of all messages, built once on first use."""
+        return ChatColumns.from_messages(self.messages)
+
+    @cached_property
+    def sorted_messages(self) -> list[Message]:
+        """Messages in timestamp order, built once on first use.
+
+        Exports are normally already in order, so this is usually an O(n)
+        check that returns self.messages; it only sorts when needed.
+        """
+        messages = self.messages
+        if all(a.timestamp <= b.timestamp for a, b in zip(messages, messages[1:])):
+            return messages
+        return sorted(messages, key=lambda m: m.timestamp)
+
+    @cached_property
+    def messages_by_sender(self) -> Mapping[str, tuple[Message, ...]]:
+        """Group messages by sender, built once on first use.
+
+        The result is shared by every caller, so it is read-only: a mapping
+        proxy over tuples.
+        """
         by_sender: dict[str, list[Message]] = {}
         for msg in self.messages:
             if msg.sender not in by_sender:
                 by_sender[msg.sender] = []
             by_sender[msg.sender].append(msg)
-        return by_sender
+        return MappingProxyType({sender: tuple(msgs) for sender, msgs in by_sender.items()})
 
 
-# Regex to match WhatsApp message header
-# Format: [M/D/YY, HH:MM:SS] Name: Message
+# Regex to match WhatsApp message header, with or without seconds
+# Format: [M/D/YY, HH:MM:SS] Name: Message  or  [M/D/YY, HH:MM] Name: Message
 MESSAGE_PATTERN = re.compile(
-    r'^\[(\d{1,2}/\d{1,2}/\d{2,4}),\s*(\d{1,2}:\d{2}:\d{2})\]\s*([^:]+):\s*(.*)$'
+    r'^\[(\d{1,2}/\d{1,2}/\d{2,4}),\s*(\d{1,2}:\d{2}(?::\d{2})?)\]\s*([^:]+):\s*(.*)$'
 )
 
-# Alternative format without seconds: [M/D/YY, HH:MM] Name: Message
-MESSAGE_PATTERN_NO_SECONDS = re.compile(
-    r'^\[(\d{1,2}/\d{1,2}/\d{2,4}),\s*(\d{1,2}:\d{2})\]\s*([^:]+):\s*(.*)$'
-)
+# Lines that could be a message header; only these are decoded and checked
+# against MESSAGE_PATTERN, everything else is continuation text
+HEADER_CANDIDATE = re.compile(rb'^\[', re.MULTILINE)
 
 # Media indicators
 MEDIA_INDICATORS = [
@@ -64,8 +137,9 @@ MEDIA_INDICATORS = [
 ]
 
 
-def parse_timestamp(date_str: str, time_str: str) -> datetime:
-    """Parse date and time strings into a datetime object."""
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str) -> datetime:
+    """Parse a M/D/YY date string to midnight; cached, as each day's date recurs for all its messages."""
     # Handle different date formats
     date_parts = date_str.split('/')
     month, day = int(date_parts[0]), int(date_parts[1])
@@ -75,77 +149,118 @@ def parse_timestamp(date_str: str, time_str: str) -> datetime:
     if year < 100:
         year += 2000
 
+    return datetime(year, month, day)
+
+
+def parse_timestamp(date_str: str, time_str: str) -> datetime:
+    """Parse date and time strings into a datetime object."""
     # Handle time with or without seconds
     time_parts = time_str.split(':')
     hour, minute = int(time_parts[0]), int(time_parts[1])
     second = int(time_parts[2]) if len(time_parts) > 2 else 0
 
-    return datetime(year, month, day, hour, minute, second)
+    return _parse_date(date_str).replace(hour=hour, minute=minute, second=second)
+
+
+def _media_pattern() -> re.Pattern:
+    """One regex matching any media indicator, case-folded by the caller.
+
+    Spaces and punctuation may appear anywhere inside an indicator (e.g.
+    "<image-omitted>"), so they are allowed between every pair of letters.
+    """
+    gap = r'(?:[^\w\s]| )*'
+    return re.compile('|'.join(
+        gap.join(re.escape(ch) for ch in indicator.lower().replace(' ', ''))
+        for indicator in MEDIA_INDICATORS
+    ))
+
+
+MEDIA_PATTERN = _media_pattern()
 
 
 def is_media_message(content: str) -> bool:
     """Check if message content indicates media."""
-    content_lower = content.lower().strip()
     # Check for media omitted markers (with or without special chars)
-    cleaned = re.sub(r'[^\w\s]', '', content_lower)
-    for indicator in MEDIA_INDICATORS:
-        if indicator.lower().replace(' ', '') in cleaned.replace(' ', ''):
-            return True
-    return False
+    return MEDIA_PATTERN.search(content.lower()) is not None
+
+
+def _iter_raw_messages(file_path: Path) -> Iterator[tuple[re.Match, str | None]]:
+    """Yield (header match, continuation text or None) for each message in an export.
+
+    The file is memory-mapped and header lines are located with one regex
+    scan over the whole buffer; only header lines and each message's
+    continuation block are decoded.
+    """
+    with open(file_path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return  # mmap can't map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            pending = None  # (header match, index just past the header line)
+
+            def emit(next_start: int):
+                match, body_start = pending
+                if body_start >= next_start:
+                    return match, None
+                # Continuation lines with universal newlines, as text mode reads them,
+                # minus the final line ending
+                body = mm[body_start:next_start].decode('utf-8')
+                body = body.replace('\r\n', '\n').replace('\r', '\n')
+                return match, body.removesuffix('\n')
+
+            for candidate in HEADER_CANDIDATE.finditer(mm):
+                start = candidate.start()
+                end = mm.find(b'\n', start)
+                if end == -1:
+                    end = size
+                match = MESSAGE_PATTERN.match(mm[start:end].decode('utf-8').removesuffix('\r'))
+                if match:
+                    if pending:
+                        yield emit(start)
+                    pending = (match, end + 1)
+
+            if pending:
+                yield emit(size)
+
+
+def iter_messages(file_path: str | Path) -> Iterator[Message]:
+    """Parse a WhatsApp chat export lazily, yielding each message as its lines are read."""
+    for match, continuation in _iter_raw_messages(Path(file_path)):
+        date_str, time_str, sender, content = match.groups()
+        # Interned so every message from a sender shares one string object
+        sender = sys.intern(sender.strip())
+        content = content.strip()
+
+        # Handle special invisible character at start
+        if content.startswith('\u200e'):
+            content = content[1:]
+
+        timestamp = parse_timestamp(date_str, time_str)
+        is_media = is_media_message(content)
+        is_edited = '<This message was edited>' in content
+
+        # Multi-line messages carry their remaining lines verbatim
+        if continuation is not None:
+            content = f"{content}\n{continuation}"
+
+        yield Message(
+            timestamp=timestamp,
+            sender=sender,
+            content=content,
+            is_media=is_media,
+            is_edited=is_edited
+        )
 
 
 def parse_chat(file_path: str | Path) -> Chat:
     """Parse a WhatsApp chat export file."""
-    file_path = Path(file_path)
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
     messages: list[Message] = []
-    participants: set[str] = set()
-    current_message: Message | None = None
-
-    for line in lines:
-        line = line.rstrip('\n')
-
-        # Try to match message header
-        match = MESSAGE_PATTERN.match(line)
-        if not match:
-            match = MESSAGE_PATTERN_NO_SECONDS.match(line)
-
-        if match:
-            # Save previous message if exists
-            if current_message:
-                messages.append(current_message)
-
-            date_str, time_str, sender, content = match.groups()
-            sender = sender.strip()
-            content = content.strip()
-
-            # Handle special invisible character at start
-            if content.startswith('\u200e'):
-                content = content[1:]
-
-            timestamp = parse_timestamp(date_str, time_str)
-            is_media = is_media_message(content)
-            is_edited = '<This message was edited>' in content
-
-            current_message = Message(
-                timestamp=timestamp,
-                sender=sender,
-                content=content,
-                is_media=is_media,
-                is_edited=is_edited
-            )
-            participants.add(sender)
-
-        elif current_message:
-            # Continuation of previous message (multi-line)
-            current_message.content += '\n' + line
-
-    # Don't forget the last message
-    if current_message:
-        messages.append(current_message)
+    participants: dict[str, None] = {}  # in order of first message
+
+    for message in iter_messages(file_path):
+        messages.append(message)
+        if message.sender not in participants:
+            participants[message.sender] = None
 
     return Chat(
         messages=messages,
@@ -154,8 +269,6 @@ def parse_chat(file_path: str | Path) -> Chat:
 
 
 if __name__ == '__main__':
-    import sys
-
     if len(sys.argv) < 2:
         print("Usage: python parser.py <chat_file>")
         sys.exit(1)
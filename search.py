@@ -1,7 +1,13 @@
 """Search system with BM25, semantic, and keyword search."""
 
+import hashlib
+import os
 import re
+import tempfile
+from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 
 import numpy as np
 from rank_bm25 import BM25Okapi
@@ -10,12 +16,39 @@ from lm_studio import LMStudioClient, get_client
 from parser import Message
 
 
+# Word tokens for BM25
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+
+# Messages shorter than this (after trimming) aren't embedded, nor is media
+MIN_EMBED_LENGTH = 3
+
+# Keyword search joins all messages with this separator to scan them in one pass
+KEYWORD_SEPARATOR = '\n\x00\n'
+
+# Regex syntax that can behave differently at a message's edges once messages
+# are joined (anchors and lookarounds); such patterns are scanned per message
+CONTEXT_SENSITIVE_SYNTAX = re.compile(r'\^|\$|\\[AZ]|\(\?<?[=!]')
+
+
+def _top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the top_k highest scores, best first, ties in index order.
+
+    Partially selects the top-k with argpartition and only sorts those.
+    """
+    if top_k < len(scores):
+        candidates = np.sort(np.argpartition(-scores, top_k)[:top_k])
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
 @dataclass
 class SearchResult:
     """A search result with score and message."""
     message: Message
     score: float
     method: str  # 'bm25', 'semantic', 'keyword', 'hybrid'
+    index: int = -1  # Position of message in the searcher's messages, if known
 
 
 class MessageSearcher:
@@ -25,53 +58,155 @@ class MessageSearcher:
         self,
         messages: list[Message],
         client: LMStudioClient | None = None,
-        embed_on_init: bool = False
+        embed_on_init: bool = False,
+        cache_dir: str | Path | None = ".embedding_cache"
     ):
         self.messages = messages
         self.client = client or get_client()
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+
+        # Sender of each message as an integer code, for vectorized filtering
+        self._sender_codes: dict[str, int] = {}
+        self._sender_ids = np.fromiter(
+            (self._sender_codes.setdefault(m.sender, len(self._sender_codes)) for m in messages),
+            dtype=np.int32,
+            count=len(messages),
+        )
 
         # Tokenized corpus for BM25
         self._corpus = [self._tokenize(m.content) for m in messages]
         self._bm25 = BM25Okapi(self._corpus)
-
-        # Embeddings for semantic search (lazy loaded)
+        # Inverted index of BM25 term weights for vectorized scoring (lazy loaded)
+        self._postings: dict[str, tuple[np.ndarray, np.ndarray]] | None = None
+
+        # Embeddings for semantic search (lazy loaded), L2-normalized, one row
+        # per message in _embedded_rows; media and trivial messages are skipped
+        self._embedded_rows = np.array([
+            i for i, m in enumerate(messages)
+            if not m.is_media and len(m.content.strip()) >= MIN_EMBED_LENGTH
+        ], dtype=np.intp)
         self._embeddings: np.ndarray | None = None
 
+        # All contents joined for keyword search, with each message's start and
+        # end offsets in the joined text (lazy loaded)
+        self._joined: tuple[str, np.ndarray, np.ndarray] | None = None
+
         if embed_on_init:
             self._compute_embeddings()
 
     def _tokenize(self, text: str) -> list[str]:
         """Simple tokenization for BM25."""
         # Lowercase and split on non-alphanumeric
-        text = text.lower()
-        tokens = re.findall(r'\b\w+\b', text)
-        return tokens
+        return TOKEN_PATTERN.findall(text.lower())
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _tokenize_query(query: str) -> tuple[str, ...]:
+        """Tokenize a search query, memoized since the same queries recur across searches."""
+        return tuple(TOKEN_PATTERN.findall(query.lower()))
 
     def _compute_embeddings(self) -> None:
-        """Compute embeddings for all messages."""
+        """Compute embeddings for all embeddable messages."""
         if self._embeddings is not None:
             return
 
-        texts = [m.content for m in self.messages]
+        texts = [self.messages[i].content for i in self._embedded_rows.tolist()]
+
+        # Embeddings depend only on the model and the message texts, so they
+        # are cached on disk under a hash of both and memory-mapped on reuse
+        cache_file = None
+        if self.cache_dir is not None:
+            h = hashlib.blake2b(self.client.embedding_model.encode(), digest_size=16)
+            for text in texts:
+                h.update(f"\0{text}".encode())
+            cache_file = self.cache_dir / f"embeddings-{h.hexdigest()}.npy"
+            if cache_file.exists():
+                # A file that can't be read, or doesn't match, is recomputed
+                try:
+                    cached = np.load(cache_file, mmap_mode='r')
+                except (OSError, ValueError):
+                    cached = None
+                if cached is not None and cached.ndim == 2 and cached.shape[0] == len(texts):
+                    self._embeddings = cached
+                    return
+
         embeddings_list = self.client.get_embeddings_batch(texts)
-        self._embeddings = np.array(embeddings_list)
-
-    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        """Compute cosine similarity between two vectors."""
-        dot = np.dot(a, b)
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return float(dot / (norm_a * norm_b))
-
-    def search_bm25(self, query: str, top_k: int = 10) -> list[SearchResult]:
-        """Search using BM25 algorithm."""
-        query_tokens = self._tokenize(query)
-        scores = self._bm25.get_scores(query_tokens)
+        # float32 halves memory and matmul bandwidth; cosine ranking doesn't need more precision
+        embeddings = np.array(embeddings_list, dtype=np.float32)
+        if not texts:
+            embeddings = embeddings.reshape(0, 0)
+
+        # Normalize once so cosine similarity is a plain dot product
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        self._embeddings = embeddings / norms
+
+        if cache_file is not None:
+            # Written to a temporary file and renamed into place, so an
+            # interrupted write never leaves a truncated cache file behind
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.npy.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.save(f, self._embeddings)
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def _build_postings(self) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """Map each term to the documents containing it and their BM25 term weights.
+
+        Weights use the same formula as BM25Okapi.get_scores, so scoring a
+        query only needs each query term's postings instead of a Python pass
+        over every document per term.
+        """
+        bm25 = self._bm25
+        doc_len = np.array(bm25.doc_len)
+        avgdl = bm25.avgdl or 1  # Zero only when every document is empty, leaving no postings
+        norm = bm25.k1 * (1 - bm25.b + bm25.b * doc_len / avgdl)
+
+        doc_ids: dict[str, list[int]] = {}
+        freqs: dict[str, list[int]] = {}
+        for i, frequencies in enumerate(bm25.doc_freqs):
+            for word, freq in frequencies.items():
+                doc_ids.setdefault(word, []).append(i)
+                freqs.setdefault(word, []).append(freq)
+
+        postings = {}
+        for word, ids in doc_ids.items():
+            ids_arr = np.array(ids, dtype=np.intp)
+            tf = np.array(freqs[word], dtype=np.float64)
+            postings[word] = (ids_arr, tf * (bm25.k1 + 1) / (tf + norm[ids_arr]))
+        return postings
+
+    def _bm25_scores(self, query_tokens: Iterable[str]) -> np.ndarray:
+        """BM25 score of every message for a tokenized query."""
+        if self._postings is None:
+            self._postings = self._build_postings()
+
+        scores = np.zeros(len(self.messages))
+        for token in query_tokens:
+            posting = self._postings.get(token)
+            if posting is not None:
+                ids, weights = posting
+                scores[ids] += self._bm25.idf[token] * weights
+        return scores
+
+    def search_bm25(
+        self,
+        query: str,
+        top_k: int = 10,
+        mask: np.ndarray | None = None
+    ) -> list[SearchResult]:
+        """Search using BM25 algorithm, optionally only over messages where mask is True."""
+        query_tokens = self._tokenize_query(query)
+        scores = self._bm25_scores(query_tokens)
+        if mask is not None:
+            scores = np.where(mask, scores, 0)
 
         # Get top-k indices
-        top_indices = np.argsort(scores)[::-1][:top_k]
+        top_indices = _top_k_indices(scores, top_k)
 
         results = []
         for idx in top_indices:
@@ -79,34 +214,44 @@ class MessageSearcher:
                 results.append(SearchResult(
                     message=self.messages[idx],
                     score=float(scores[idx]),
-                    method='bm25'
+                    method='bm25',
+                    index=int(idx)
                 ))
 
         return results
 
-    def search_semantic(self, query: str, top_k: int = 10) -> list[SearchResult]:
-        """Search using semantic similarity with embeddings."""
+    def search_semantic(
+        self,
+        query: str,
+        top_k: int = 10,
+        mask: np.ndarray | None = None
+    ) -> list[SearchResult]:
+        """Search using semantic similarity with embeddings, optionally only where mask is True."""
         self._compute_embeddings()
         assert self._embeddings is not None
 
-        query_embedding = np.array(self.client.get_embedding(query))
+        query_embedding = np.array(self.client.get_embedding(query), dtype=np.float32)
+        query_embedding /= np.linalg.norm(query_embedding) or 1
 
-        # Compute similarities
-        similarities = []
-        for i, emb in enumerate(self._embeddings):
-            sim = self._cosine_similarity(query_embedding, emb)
-            similarities.append((i, sim))
+        # Cosine similarity against every embedded message in one matrix-vector
+        # product; messages that weren't embedded score 0 and are never returned
+        similarities = np.zeros(len(self.messages), dtype=np.float32)
+        if len(self._embedded_rows):
+            similarities[self._embedded_rows] = self._embeddings @ query_embedding
+        if mask is not None:
+            similarities = np.where(mask, similarities, 0)
 
-        # Sort by similarity
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        top_indices = _top_k_indices(similarities, top_k)
 
         results = []
-        for idx, score in similarities[:top_k]:
+        for idx in top_indices:
+            score = float(similarities[idx])
             if score > 0:
                 results.append(SearchResult(
                     message=self.messages[idx],
                     score=score,
-                    method='semantic'
+                    method='semantic',
+                    index=int(idx)
                 ))
 
         return results
@@ -115,9 +260,10 @@ class MessageSearcher:
         self,
         pattern: str,
         case_insensitive: bool = True,
-        top_k: int = 100
+        top_k: int = 100,
+        mask: np.ndarray | None = None
     ) -> list[SearchResult]:
-        """Search using regex pattern matching (grep-like)."""
+        """Search using regex pattern matching (grep-like), optionally only where mask is True."""
         flags = re.IGNORECASE if case_insensitive else 0
 
         try:
@@ -126,78 +272,100 @@ class MessageSearcher:
             # Fall back to literal search if invalid regex
             regex = re.compile(re.escape(pattern), flags)
 
+        # Score based on number of matches
+        counts = self._keyword_match_counts(regex, mask)
+
         results = []
-        for msg in self.messages:
-            matches = list(regex.finditer(msg.content))
-            if matches:
-                # Score based on number of matches
-                score = len(matches)
-                results.append(SearchResult(
-                    message=msg,
-                    score=float(score),
-                    method='keyword'
-                ))
+        for idx in np.flatnonzero(counts).tolist():
+            results.append(SearchResult(
+                message=self.messages[idx],
+                score=float(counts[idx]),
+                method='keyword',
+                index=idx
+            ))
 
         # Sort by score and return top_k
         results.sort(key=lambda x: x.score, reverse=True)
         return results[:top_k]
 
+    def _keyword_match_counts(self, regex: re.Pattern, mask: np.ndarray | None = None) -> np.ndarray:
+        """Number of non-overlapping regex matches in each message (zero outside mask).
+
+        Messages are scanned as one joined text in a single finditer pass
+        whenever that gives the same counts as scanning them one by one; it
+        doesn't for anchored or lookaround patterns, or when a match is empty
+        or crosses a message boundary, and those fall back to per-message scans.
+        """
+        n = len(self.messages)
+        counts = np.zeros(n, dtype=np.int64)
+
+        if not CONTEXT_SENSITIVE_SYNTAX.search(regex.pattern):
+            if self._joined is None:
+                lengths = np.fromiter((len(m.content) for m in self.messages), dtype=np.int64, count=n)
+                starts = np.zeros(n, dtype=np.int64)
+                np.cumsum(lengths[:-1] + len(KEYWORD_SEPARATOR), out=starts[1:])
+                joined = KEYWORD_SEPARATOR.join(m.content for m in self.messages)
+                self._joined = (joined, starts, starts + lengths)
+            joined, starts, ends = self._joined
+
+            spans = np.array([match.span() for match in regex.finditer(joined)], dtype=np.int64).reshape(-1, 2)
+            rows = np.searchsorted(starts, spans[:, 0], side='right') - 1
+            if not ((spans[:, 1] > ends[rows]).any() or (spans[:, 0] == spans[:, 1]).any()):
+                counts += np.bincount(rows, minlength=n)
+                if mask is not None:
+                    counts[~mask] = 0
+                return counts
+
+        rows = range(n) if mask is None else np.flatnonzero(mask).tolist()
+        for idx in rows:
+            counts[idx] = sum(1 for _ in regex.finditer(self.messages[idx].content))
+        return counts
+
     def search_hybrid(
         self,
         query: str,
         top_k: int = 10,
         bm25_weight: float = 0.3,
         semantic_weight: float = 0.5,
-        keyword_weight: float = 0.2
+        keyword_weight: float = 0.2,
+        mask: np.ndarray | None = None
     ) -> list[SearchResult]:
-        """Combine all search methods with weighted scoring."""
+        """Combine all search methods with weighted scoring, optionally only where mask is True."""
         # Get results from each method
-        bm25_results = self.search_bm25(query, top_k=top_k * 2)
-        semantic_results = self.search_semantic(query, top_k=top_k * 2)
-        keyword_results = self.search_keyword(query, top_k=top_k * 2)
-
-        # Normalize scores within each method
-        def normalize_scores(results: list[SearchResult]) -> dict[int, float]:
-            if not results:
-                return {}
-            max_score = max(r.score for r in results)
-            if max_score == 0:
-                return {}
-            return {
-                id(r.message): r.score / max_score
-                for r in results
-            }
-
-        bm25_scores = normalize_scores(bm25_results)
-        semantic_scores = normalize_scores(semantic_results)
-        keyword_scores = normalize_scores(keyword_results)
-
-        # Combine scores
-        message_scores: dict[int, tuple[Message, float]] = {}
-
-        for results, scores, weight in [
-            (bm25_results, bm25_scores, bm25_weight),
-            (semantic_results, semantic_scores, semantic_weight),
-            (keyword_results, keyword_scores, keyword_weight),
+        bm25_results = self.search_bm25(query, top_k=top_k * 2, mask=mask)
+        semantic_results = self.search_semantic(query, top_k=top_k * 2, mask=mask)
+        keyword_results = self.search_keyword(query, top_k=top_k * 2, mask=mask)
+
+        # Accumulate normalized, weighted scores per message index; first_seen
+        # keeps ties in the order results were first returned
+        n = len(self.messages)
+        combined = np.zeros(n)
+        unseen = np.iinfo(np.intp).max
+        first_seen = np.full(n, unseen, dtype=np.intp)
+        seen = 0
+
+        for results, weight in [
+            (bm25_results, bm25_weight),
+            (semantic_results, semantic_weight),
+            (keyword_results, keyword_weight),
         ]:
-            for r in results:
-                msg_id = id(r.message)
-                normalized = scores.get(msg_id, 0)
-                if msg_id not in message_scores:
-                    message_scores[msg_id] = (r.message, 0.0)
-                msg, score = message_scores[msg_id]
-                message_scores[msg_id] = (msg, score + normalized * weight)
+            if not results:
+                continue
+            idxs = np.array([r.index for r in results], dtype=np.intp)
+            scores = np.array([r.score for r in results])
+            max_score = scores.max()
+            if max_score != 0:
+                combined[idxs] += (scores / max_score) * weight
+            np.minimum.at(first_seen, idxs, np.arange(seen, seen + len(idxs)))
+            seen += len(idxs)
 
         # Sort and return top results
-        sorted_results = sorted(
-            message_scores.values(),
-            key=lambda x: x[1],
-            reverse=True
-        )
+        candidates = np.flatnonzero(first_seen != unseen)
+        ranked = candidates[np.lexsort((first_seen[candidates], -combined[candidates]))]
 
         return [
-            SearchResult(message=msg, score=score, method='hybrid')
-            for msg, score in sorted_results[:top_k]
+            SearchResult(message=self.messages[idx], score=float(combined[idx]), method='hybrid', index=int(idx))
+            for idx in ranked[:top_k]
         ]
 
     def find_similar_messages(
@@ -215,18 +383,21 @@ class MessageSearcher:
         top_k: int = 10
     ) -> list[SearchResult]:
         """Search within a specific sender's messages."""
-        sender_messages = [m for m in self.messages if m.sender == sender]
+        code = self._sender_codes.get(sender)
+        if code is None:
+            return []
+        mask = self._sender_ids == code
 
         if not query:
             # Return most recent messages
             return [
-                SearchResult(message=m, score=1.0, method='filter')
-                for m in sender_messages[-top_k:]
+                SearchResult(message=self.messages[i], score=1.0, method='filter', index=i)
+                for i in np.flatnonzero(mask).tolist()[-top_k:]
             ]
 
-        # Create temporary searcher for sender's messages
-        temp_searcher = MessageSearcher(sender_messages, self.client)
-        return temp_searcher.search_hybrid(query, top_k=top_k)
+        # Search the whole index restricted to this sender's messages, reusing
+        # the existing BM25 index and embeddings instead of building new ones
+        return self.search_hybrid(query, top_k=top_k, mask=mask)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,35 @@
+"""Tests for analytics word and URL counting."""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analytics import compute_participant_stats, count_words
+from parser import Message
+
+
+def _stats(*contents: str):
+    messages = [Message(timestamp=datetime(2025, 1, 1, 12), sender="A", content=c) for c in contents]
+    return compute_participant_stats("A", messages)
+
+
+def test_url_glued_to_word_counts_as_url():
+    # The URL is taken out first, leaving just "foo"
+    assert count_words("foohttp://z.com") == 1
+    stats = _stats("foohttp://z.com")
+    assert stats.url_count == 1
+    assert stats.total_words == 1
+
+
+def test_url_glued_to_word_in_non_ascii_message():
+    stats = _stats("café😂foohttps://z.com/ä bar")
+    assert stats.url_count == 1
+    assert stats.total_words == 3  # café, foo, bar
+    assert stats.emoji_count == 1
+
+
+def test_bare_scheme_is_not_a_url():
+    assert count_words("xhttps:// y") == 2  # xhttps, y
+    assert _stats("xhttps:// y").url_count == 0
@@ -1,15 +1,135 @@
 """Wrapped content generator using LLM and search."""
 
+import json
 import random
+import re
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
 
 from analytics import ChatAnalytics, ParticipantStats
-from features import ChatFeatures, PersonalityProfile, ConversationThread, TopicTimeline
+from features import (
+    ARCHETYPES,
+    ChatFeatures,
+    PersonalityProfile,
+    ConversationThread,
+    TopicTimeline,
+)
 from lm_studio import LMStudioClient, get_client
 from parser import Chat, Message
 from search import MessageSearcher
 
 
+# Shorter messages (and media) are never sampled for prompts
+MIN_SAMPLE_LENGTH = 20
+
+# Messages sampled per participant. Every prompt about them sends the same
+# sample, so the requests share their text (and LM Studio's cached prefill)
+PARTICIPANT_SAMPLE_SIZE = 40
+
+# Longer messages are truncated in prompts. The budget is in UTF-8 bytes
+# rather than characters: the models' byte-level tokenizers spend several
+# tokens on each emoji or CJK character, so this bounds tokens in any script
+# (ASCII text keeps 300 characters)
+MAX_MESSAGE_BYTES = 300
+
+# Marks a message with personality, making it a memorable-quote candidate
+PERSONALITY_PATTERN = re.compile(r'haha|lol|wtf|omg|[!?]', re.IGNORECASE)
+
+# Every request shares one system prompt, and every request about a
+# participant opens with the same block of their name, stats and sampled
+# messages; only the task at the end differs. So the requests about one
+# participant share a long byte-identical prefix that LM Studio can serve
+# from its prompt cache, instead of each re-reading the messages
+WRAPPED_SYSTEM_PROMPT = """You write fun, witty Spotify Wrapped-style content about a group chat and its participants. Be concise, playful, and specific. No generic praise - find unique quirks.
+
+You are given a participant's name, stats and a sample of their messages (or the group's), followed by a task: a personality summary, topics, quote picks, an achievement, a tagline or the group's vibe. Do exactly that task."""
+
+PERSONALITY_SUMMARY_TASK = """Task: write a SHORT, fun, Spotify Wrapped-style personality summary of this participant (2-3 sentences max). Be playful and specific to what you see in the messages. Don't be generic. Also write a SHORT witty tagline for them (5-8 words max), Twitter bio energy. Return a JSON object with personality_summary and tagline."""
+
+TOP_TOPICS_TASK = """Task: identify this participant's top conversation topics or interests. Be specific and concise. Return a JSON object whose "topics" field is the list of topics (just the topic names)."""
+
+MEMORABLE_QUOTES_TASK = """Task: pick the most memorable, funny, or quotable of these messages - ones that are funny, insightful, or uniquely characteristic, and would make good "Wrapped" highlights. Return a JSON object whose "quotes" field is the list of quotes, each copied exactly (just the quote text)."""
+
+ACHIEVEMENT_TASK = """Task: create ONE funny video-game style achievement for this participant.
+
+The achievement should be:
+- Based on their personality/communication style (sarcastic? supportive? dramatic? nerdy?)
+- Funny and specific to something you notice in their messages
+- Formatted as: {"emoji": EMOJI, "title": TITLE, "description": DESCRIPTION}
+
+Examples:
+{"emoji": "💀", "title": "ROAST MASTER", "description": "Delivered burns so sick they need aloe vera"}
+{"emoji": "🎭", "title": "DRAMA MONARCH", "description": "Every story is an epic saga with twists"}
+{"emoji": "🧠", "title": "WIKIPEDIA BRAIN", "description": "Always dropping random knowledge bombs"}
+{"emoji": "🌶️", "title": "SPICY TAKE SPECIALIST", "description": "Hot opinions served fresh daily"}
+{"emoji": "👻", "title": "PHANTOM", "description": "Disappears for weeks then drops a novel"}
+
+Output ONE achievement as a JSON object (no extra text)."""
+
+TAGLINE_TASK = """Task: write a SHORT witty tagline (5-8 words max) for this participant. Think Twitter bio energy. Output only the tagline."""
+
+GROUP_VIBE_TASK = """Task: describe the group's overall VIBE in 2-3 fun sentences. What kind of friend group is this? What energy do they bring? Be specific about the vibe, not generic."""
+
+# One request producing a participant's whole Wrapped, for quick mode
+PARTICIPANT_WRAPPED_TASK = """Task: write this participant's whole Wrapped. Return a JSON object with:
+- personality_summary: a SHORT, fun personality summary (2-3 sentences max), specific to what you see in the messages
+- top_topics: their top 5 conversation topics or interests (just the topic names)
+- memorable_quotes: the 5 most memorable, funny, or quotable messages, copied exactly
+- achievement: ONE funny video-game style achievement based on their communication style, with an emoji, a short TITLE and a one-line description (e.g. 💀, ROAST MASTER, Delivered burns so sick they need aloe vera)
+- tagline: a SHORT witty tagline (5-8 words max), Twitter bio energy"""
+
+
+def _truncate_utf8(text: str, limit: int) -> str:
+    """Cut text to at most limit UTF-8 bytes, dropping any character cut in half."""
+    if len(text) * 4 <= limit:  # fits even at 4 bytes per character
+        return text
+    if text.isascii():
+        return text[:limit]
+    return text.encode('utf-8')[:limit].decode('utf-8', 'ignore')
+
+
+def _json_schema_format(name: str, schema: dict) -> dict:
+    """response_format constraining the LLM's output to JSON matching schema."""
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
+
+# Output schemas, enforced by LM Studio's constrained decoding so responses always parse
+PERSONALITY_SUMMARY_SCHEMA = _json_schema_format("personality_summary", {
+    "type": "object",
+    "properties": {
+        "personality_summary": {"type": "string"},
+        "tagline": {"type": "string"},
+    },
+    "required": ["personality_summary", "tagline"],
+})
+
+ACHIEVEMENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "emoji": {"type": "string"},
+        "title": {"type": "string"},
+        "description": {"type": "string"},
+    },
+    "required": ["emoji", "title", "description"],
+}
+
+PARTICIPANT_WRAPPED_SCHEMA = _json_schema_format("participant_wrapped", {
+    "type": "object",
+    "properties": {
+        "personality_summary": {"type": "string"},
+        "top_topics": {"type": "array", "items": {"type": "string"}, "minItems": 1, "maxItems": 5},
+        "memorable_quotes": {"type": "array", "items": {"type": "string"}, "maxItems": 5},
+        "achievement": ACHIEVEMENT_SCHEMA,
+        "tagline": {"type": "string"},
+    },
+    "required": ["personality_summary", "top_topics", "memorable_quotes", "achievement", "tagline"],
+})
+
+
 @dataclass
 class Achievement:
     """A video-game style achievement for a participant."""
@@ -55,50 +175,68 @@ class WrappedGenerator:
         chat: Chat,
         analytics: ChatAnalytics,
         client: LMStudioClient | None = None,
-        features: ChatFeatures | None = None
+        features: ChatFeatures | None = None,
+        use_llm_personality: bool = True
     ):
         self.chat = chat
         self.analytics = analytics
         self.client = client or get_client()
         self.searcher = MessageSearcher(chat.messages, self.client)
         self.features = features  # Optional deep features
-
-    def _sample_messages(
-        self,
-        messages: list[Message],
-        n: int = 30,
-        min_length: int = 20
-    ) -> list[Message]:
-        """Sample representative messages from a list."""
-        # Filter out media and very short messages
-        good_messages = [
-            m for m in messages
-            if not m.is_media and len(m.content) >= min_length
-        ]
-
-        if len(good_messages) <= n:
-            return good_messages
-
-        # Sample evenly across the time range
-        return random.sample(good_messages, n)
-
-    def _format_messages_for_llm(self, messages: list[Message]) -> str:
-        """Format messages for LLM input."""
-        formatted = []
-        for msg in messages:
-            content = msg.content[:300]  # Truncate long messages
-            formatted.append(f"- {content}")
-        return '\n'.join(formatted)
-
-    def generate_personality_summary(self, name: str) -> str:
-        """Generate a fun personality summary for a participant."""
-        messages = self.chat.messages_by_sender.get(name, [])
-        if not messages:
-            return "A mysterious presence in the chat..."
-
-        sample = self._sample_messages(messages, n=40)
-        messages_text = self._format_messages_for_llm(sample)
-
+        # When off, personality summaries are templated from the features'
+        # profiles instead, saving an LLM call per participant at the cost of
+        # repeating what the archetype section already says
+        self.use_llm_personality = use_llm_personality
+        self._formatted_samples: dict[str, str] = {}
+        self._taglines: dict[str, str] = {}  # filled in bulk by generate_taglines()
+        self._achievements: dict[str, list[Achievement]] = {}
+
+    @cached_property
+    def _content_lengths(self) -> np.ndarray:
+        """Length of every message's content, aligned with chat.messages."""
+        contents = self.chat.columns.contents
+        return np.fromiter(map(len, contents), dtype=np.int64, count=len(contents))
+
+    @cached_property
+    def _rows_by_sender(self) -> dict[str, np.ndarray]:
+        """Indices into chat.messages of each sender's messages, in order."""
+        return self.chat.columns.rows_by_sender()
+
+    @cached_property
+    def _good_mask(self) -> np.ndarray:
+        """Which messages are samplable (no media, not too short), aligned with chat.messages."""
+        return ~self.chat.columns.is_media & (self._content_lengths >= MIN_SAMPLE_LENGTH)
+
+    @cached_property
+    def _good_messages_by_sender(self) -> dict[str, tuple[Message, ...]]:
+        """Each sender's samplable messages, filtered once.
+
+        The filter runs as one vectorized mask over the column arrays, so only
+        the selected Message objects are touched.
+        """
+        messages = self.chat.messages
+        good = self._good_mask
+        return {
+            name: tuple(messages[i] for i in rows[good[rows]].tolist())
+            for name, rows in self._rows_by_sender.items()
+        }
+
+    def _formatted_sample(self, name: str) -> str:
+        """A sample of a participant's messages, formatted for the LLM.
+
+        Every prompt about the participant uses this one sample. It is seeded
+        from the name, so it is also the same on every run, and an unchanged
+        chat hits the completion cache on a re-run.
+        """
+        if name not in self._formatted_samples:
+            n = PARTICIPANT_SAMPLE_SIZE
+            good = self._good_messages_by_sender.get(name, ())
+            sample = good if len(good) <= n else random.Random(f"{name}/{n}").sample(good, n)
+            self._formatted_samples[name] = self._format_messages_for_llm(sample)
+        return self._formatted_samples[name]
+
+    def _participant_context(self, name: str) -> str:
+        """The opening of every prompt about a participant: name, stats and message sample."""
         stats = self.analytics.participant_stats.get(name)
         stats_context = ""
         if stats:
@@ -111,55 +249,117 @@ Stats:
 - Average message length: {stats.avg_message_length:.0f} characters
 """
 
-        prompt = f"""Based on these chat messages from {name}, write a SHORT, fun, Spotify Wrapped-style personality summary (2-3 sentences max). Be playful and specific to what you see in the messages. Don't be generic.
+        return f"""Participant: {name}
 {stats_context}
 Sample messages:
-{messages_text}
+{self._formatted_sample(name)}
+
+"""
+
+    def _sample_group_messages(self, n: int) -> list[Message]:
+        """A seeded sample of up to n samplable messages from the whole chat.
+
+        Rows are drawn from the column mask, so only the n sampled Message
+        objects are touched.
+        """
+        rows = np.flatnonzero(self._good_mask)
+        if len(rows) > n:
+            rows = rows[random.Random(f"group/{n}").sample(range(len(rows)), n)]
+        messages = self.chat.messages
+        return [messages[i] for i in rows.tolist()]
 
-Write the personality summary for {name} (2-3 sentences, fun and specific):"""
+    def _format_messages_for_llm(self, messages: Sequence[Message]) -> str:
+        """Format messages for LLM input."""
+        return '\n'.join('- ' + _truncate_utf8(msg.content, MAX_MESSAGE_BYTES) for msg in messages)
+
+    def _profile_summary(self, name: str, profile: PersonalityProfile) -> str:
+        """Personality summary templated from an extracted profile (no LLM)."""
+        first_name = name.split()[0]
+        description = ARCHETYPES[profile.archetype]["description"]
+        return (
+            f"{first_name} is {profile.archetype} {profile.archetype_emoji} of the chat: "
+            f"{description[0].lower()}{description[1:]}."
+        )
+
+    def _summary_profile(self, name: str) -> PersonalityProfile | None:
+        """The participant's extracted profile, if their personality summary is templated from it."""
+        if self.use_llm_personality or not self.features:
+            return None
+        profile = self.features.personality_profiles.get(name)
+        return profile if profile and profile.archetype in ARCHETYPES else None
+
+    def generate_personality_summary(self, name: str) -> str:
+        """Generate a fun personality summary for a participant.
+
+        The LLM writes their tagline in the same request, and it is kept for
+        generate_tagline(). With use_llm_personality off, the summary is
+        instead built from their deep-features profile, when there is one.
+        """
+        if name not in self._rows_by_sender:
+            return "A mysterious presence in the chat..."
+
+        profile = self._summary_profile(name)
+        if profile:
+            return self._profile_summary(name, profile)
+
+        prompt = f"""{self._participant_context(name)}{PERSONALITY_SUMMARY_TASK}
+
+Personality summary (2-3 sentences, fun and specific) and tagline for {name} (JSON object):"""
 
         try:
-            return self.client.generate(
+            result = json.loads(self.client.generate(
                 prompt,
-                system_prompt="You write fun, witty Spotify Wrapped-style summaries. Be concise, playful, and specific. No generic praise - find unique quirks.",
-                temperature=0.8
-            ).strip()
+                system_prompt=WRAPPED_SYSTEM_PROMPT,
+                temperature=0.8,
+                max_tokens=200,
+                response_format=PERSONALITY_SUMMARY_SCHEMA
+            ))
+            tagline = result["tagline"].strip().strip('"')
+            if tagline:
+                self._taglines.setdefault(name, tagline)
+            return result["personality_summary"].strip()
         except Exception as e:
             return f"The enigmatic {name}, keeper of messages..."
 
     def generate_top_topics(self, name: str, n: int = 5) -> list[str]:
         """Identify top conversation topics for a participant."""
-        messages = self.chat.messages_by_sender.get(name, [])
-        if not messages:
+        if name not in self._rows_by_sender:
             return []
 
-        sample = self._sample_messages(messages, n=50)
-        messages_text = self._format_messages_for_llm(sample)
+        prompt = f"""{self._participant_context(name)}{TOP_TOPICS_TASK}
 
-        prompt = f"""Based on these messages from {name}, identify their TOP {n} conversation topics or interests.
-
-Messages:
-{messages_text}
-
-List exactly {n} topics, one per line (just the topic name, no numbers or bullets):"""
+List exactly {n} topics for {name} (JSON object):"""
 
         try:
             response = self.client.generate(
                 prompt,
-                system_prompt="You analyze chat messages to identify recurring topics and interests. Be specific and concise.",
-                temperature=0.5
+                system_prompt=WRAPPED_SYSTEM_PROMPT,
+                temperature=0.5,
+                max_tokens=100,
+                response_format=_json_schema_format("top_topics", {
+                    "type": "object",
+                    "properties": {
+                        "topics": {"type": "array", "items": {"type": "string"}, "minItems": n, "maxItems": n},
+                    },
+                    "required": ["topics"],
+                })
             )
-            topics = [line.strip() for line in response.strip().split('\n') if line.strip()]
+            topics = [topic.strip() for topic in json.loads(response)["topics"] if topic.strip()]
             return topics[:n]
         except Exception:
             return ["Life", "The Universe", "Everything"]
 
     def find_memorable_quotes(self, name: str, n: int = 5) -> list[str]:
         """Find memorable/funny quotes from a participant using search."""
-        messages = self.chat.messages_by_sender.get(name, [])
-        if not messages:
+        rows = self._rows_by_sender.get(name)
+        if rows is None:
             return []
 
+        # Select by the column arrays first, and only then touch the messages
+        messages = self.chat.messages
+        text_rows = rows[~self.chat.columns.is_media[rows]]
+        lengths = self._content_lengths[text_rows]
+
         # Use various search queries to find interesting messages
         search_queries = [
             "funny hilarious lol lmao haha",
@@ -167,61 +367,117 @@ List exactly {n} topics, one per line (just the topic name, no numbers or bullet
             "actually honestly literally basically",
         ]
 
-        candidates: list[Message] = []
-
-        # Keyword search for interesting messages
-        for msg in messages:
-            if not msg.is_media and len(msg.content) > 30:
-                # Prioritize messages with personality
-                content_lower = msg.content.lower()
-                if any(word in content_lower for word in ['haha', 'lol', '!', '?', 'wtf', 'omg']):
-                    candidates.append(msg)
-
-        # Also add some random longer messages
-        long_messages = [m for m in messages if not m.is_media and len(m.content) > 50]
-        if long_messages:
-            candidates.extend(random.sample(long_messages, min(10, len(long_messages))))
-
-        if not candidates:
-            candidates = [m for m in messages if not m.is_media][:20]
-
-        if not candidates:
+        # Score each longer message once, prioritizing ones with personality:
+        # two points per distinct keyword or punctuation mark, one for length,
+        # one for a 😂. Only the regex runs per message; the scoring and top-20
+        # selection are array operations
+        long_rows = text_rows[lengths > 30]
+        contents = [messages[i].content for i in long_rows.tolist()]
+        hits = np.fromiter(
+            (len({hit.lower() for hit in PERSONALITY_PATTERN.findall(c)}) for c in contents),
+            dtype=np.int64, count=len(contents)
+        )
+        laughs = np.fromiter(('😂' in c for c in contents), dtype=bool, count=len(contents))
+        scores = 2 * hits + (lengths[lengths > 30] > 80) + laughs
+
+        # Ties are broken by a random fraction, seeded from the name so the
+        # same chat gives the same prompt (and a completion cache hit) every run
+        rng = np.random.default_rng(random.Random(f"{name}/quotes").getrandbits(64))
+        keys = scores + rng.random(len(scores))
+
+        # Keep the 20 best for the LLM to pick from, best first
+        top = np.argpartition(-keys, 20)[:20] if len(keys) > 20 else np.arange(len(keys))
+        candidate_rows = long_rows[top[np.argsort(-keys[top])]].tolist()
+
+        if not candidate_rows:
+            candidate_rows = text_rows[:20].tolist()
+
+        if not candidate_rows:
             return []
 
         # Use LLM to pick the best quotes
-        sample = random.sample(candidates, min(20, len(candidates)))
-        messages_text = self._format_messages_for_llm(sample)
+        candidates = [messages[i] for i in candidate_rows]
+        messages_text = self._format_messages_for_llm(candidates)
 
-        prompt = f"""From these messages by {name}, pick the {n} most memorable, funny, or quotable ones. These should be messages that would make good "Wrapped" highlights.
+        prompt = f"""Participant: {name}
 
 Messages:
 {messages_text}
 
-Copy exactly {n} of the best quotes (just the quote text, one per line):"""
+{MEMORABLE_QUOTES_TASK}
+
+Copy exactly {n} of the best quotes (JSON object):"""
 
         try:
             response = self.client.generate(
                 prompt,
-                system_prompt="You select the most memorable and quotable messages. Pick ones that are funny, insightful, or uniquely characteristic.",
-                temperature=0.7
+                system_prompt=WRAPPED_SYSTEM_PROMPT,
+                temperature=0.7,
+                max_tokens=500,
+                response_format=_json_schema_format("memorable_quotes", {
+                    "type": "object",
+                    "properties": {
+                        "quotes": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "minItems": min(n, len(candidates)),
+                            "maxItems": n,
+                        },
+                    },
+                    "required": ["quotes"],
+                })
             )
-            quotes = [line.strip().strip('-').strip() for line in response.strip().split('\n') if line.strip()]
+            quotes = [quote.strip() for quote in json.loads(response)["quotes"] if quote.strip()]
             return quotes[:n]
         except Exception:
             # Fallback to random quotes
-            return [m.content[:100] for m in random.sample(candidates, min(n, len(candidates)))]
+            return [m.content[:100] for m in candidates[:n]]
 
     def generate_achievements(self, name: str) -> list[Achievement]:
-        """Generate video-game style achievements based on statistics."""
+        """Generate video-game style achievements based on statistics.
+
+        Each participant's list is generated once and then shared, so the
+        group's achievements ceremony and their own Wrapped show the same ones.
+        """
+        if name in self._achievements:
+            return self._achievements[name]
+
         stats = self.analytics.participant_stats.get(name)
         if not stats:
             return []
 
-        achievements = []
+        achievements = self._stat_achievements(name, stats)
+
+        # Use LLM to generate a fun personalized achievement
+        llm_achievement = self._generate_llm_achievement(name, stats)
+        if llm_achievement:
+            achievements.append(llm_achievement)
+
+        # Limit to 3-5 achievements
+        self._achievements[name] = achievements[:5]
+        return self._achievements[name]
+
+    @cached_property
+    def _leaders(self) -> dict[str, str | float | None]:
+        """Who leads (or trails) each achievement stat, computed once for all participants."""
         analytics = self.analytics
+        all_stats = analytics.participant_stats.values()
+        return {
+            'top_chatter': analytics.get_top_chatter(),
+            'novelist': analytics.get_novelist(),
+            'link_lord': analytics.get_link_lord(),
+            'catalyst': analytics.get_conversation_catalyst() if analytics.conversation_starts else None,
+            'fewest_messages': min(s.total_messages for s in all_stats),
+            'shortest_avg_length': min(s.avg_message_length for s in all_stats),
+        }
+
+    def _stat_achievements(self, name: str, stats: ParticipantStats) -> list[Achievement]:
+        """Achievements earned purely from statistics (no LLM)."""
+        achievements = []
+        leaders = self._leaders
 
         # Message volume achievements
-        if name == analytics.get_top_chatter():
+        if name == leaders['top_chatter']:
             achievements.append(Achievement(
                 emoji="🗣️",
                 title="CHAT CHAMPION",
@@ -229,8 +485,7 @@ Copy exactly {n} of the best quotes (just the quote text, one per line):"""
             ))
         else:
             # Check if they're the quietest
-            all_counts = [s.total_messages for s in analytics.participant_stats.values()]
-            if stats.total_messages == min(all_counts):
+            if stats.total_messages == leaders['fewest_messages']:
                 achievements.append(Achievement(
                     emoji="🤫",
                     title="LURKER LORD",
@@ -238,7 +493,7 @@ Copy exactly {n} of the best quotes (just the quote text, one per line):"""
                 ))
 
         # Message length achievements
-        if name == analytics.get_novelist():
+        if name == leaders['novelist']:
             achievements.append(Achievement(
                 emoji="✍️",
                 title="ESSAYIST",
@@ -246,8 +501,7 @@ Copy exactly {n} of the best quotes (just the quote text, one per line):"""
             ))
         else:
             # Check if shortest messages
-            all_lengths = [s.avg_message_length for s in analytics.participant_stats.values()]
-            if stats.avg_message_length == min(all_lengths):
+            if stats.avg_message_length == leaders['shortest_avg_length']:
                 achievements.append(Achievement(
                     emoji="⚡",
                     title="SPEED TEXTER",
@@ -269,19 +523,17 @@ Copy exactly {n} of the best quotes (just the quote text, one per line):"""
                 description=f"Up and texting by {stats.most_active_hour}:00—catches all the worms"
             ))
 
-        # Check for weekend warrior (more messages on weekends)
-        if stats.messages_by_weekday:
-            weekend = stats.messages_by_weekday.get('Saturday', 0) + stats.messages_by_weekday.get('Sunday', 0)
-            weekday = sum(v for k, v in stats.messages_by_weekday.items() if k not in ['Saturday', 'Sunday'])
-            if weekend > 0 and weekday > 0 and (weekend / 2) > (weekday / 5):
-                achievements.append(Achievement(
-                    emoji="📅",
-                    title="WEEKEND WARRIOR",
-                    description="Party mode activated on Saturdays and Sundays"
-                ))
+        # Check for weekend warrior (more messages per day on weekends: 2 days vs 5)
+        weekend, weekday = stats.weekend_count, stats.weekday_count
+        if weekend > 0 and weekday > 0 and weekend * 5 > weekday * 2:
+            achievements.append(Achievement(
+                emoji="📅",
+                title="WEEKEND WARRIOR",
+                description="Party mode activated on Saturdays and Sundays"
+            ))
 
         # Content-based achievements
-        if name == analytics.get_link_lord():
+        if name == leaders['link_lord']:
             achievements.append(Achievement(
                 emoji="🔗",
                 title="LINK DEALER",
@@ -296,100 +548,94 @@ Copy exactly {n} of the best quotes (just the quote text, one per line):"""
             ))
 
         # Conversation starter achievement
-        if name == analytics.get_conversation_catalyst():
+        if name == leaders['catalyst']:
             achievements.append(Achievement(
                 emoji="🎤",
                 title="CONVERSATION STARTER",
                 description=f"Broke {stats.conversation_starts} silences—always bringing the energy"
             ))
 
-        # Use LLM to generate a fun personalized achievement
-        llm_achievement = self._generate_llm_achievement(name, stats)
-        if llm_achievement:
-            achievements.append(llm_achievement)
-
-        # Limit to 3-5 achievements
-        return achievements[:5]
+        return achievements
 
     def _generate_llm_achievement(self, name: str, stats: ParticipantStats) -> Achievement | None:
         """Use LLM to generate a fun, personalized achievement."""
-        messages = self.chat.messages_by_sender.get(name, [])
-        if not messages:
+        if name not in self._rows_by_sender:
             return None
 
-        sample = self._sample_messages(messages, n=30)
-        messages_text = self._format_messages_for_llm(sample)
+        prompt = f"""{self._participant_context(name)}{ACHIEVEMENT_TASK}
 
-        prompt = f"""Based on these messages from {name}, create ONE funny video-game style achievement for them.
-
-Sample messages:
-{messages_text}
-
-The achievement should be:
-- Based on their personality/communication style (sarcastic? supportive? dramatic? nerdy?)
-- Funny and specific to something you notice in their messages
-- Formatted as: EMOJI|TITLE|DESCRIPTION
-
-Examples:
-💀|ROAST MASTER|Delivered burns so sick they need aloe vera
-🎭|DRAMA MONARCH|Every story is an epic saga with twists
-🧠|WIKIPEDIA BRAIN|Always dropping random knowledge bombs
-🌶️|SPICY TAKE SPECIALIST|Hot opinions served fresh daily
-👻|PHANTOM|Disappears for weeks then drops a novel
-
-Output ONE achievement in the format EMOJI|TITLE|DESCRIPTION (no extra text):"""
+Achievement for {name} (JSON object):"""
 
         try:
-            response = self.client.generate(
+            # The schema ends generation at the object's closing brace
+            result = json.loads(self.client.generate(
                 prompt,
-                system_prompt="You create funny, specific video-game achievements. Output exactly one achievement in EMOJI|TITLE|DESCRIPTION format.",
+                system_prompt=WRAPPED_SYSTEM_PROMPT,
                 temperature=0.9,
-                max_tokens=100
-            ).strip()
-
-            # Parse the response
-            parts = response.split('|')
-            if len(parts) >= 3:
-                return Achievement(
-                    emoji=parts[0].strip(),
-                    title=parts[1].strip().upper(),
-                    description=parts[2].strip()
-                )
+                max_tokens=100,
+                response_format=_json_schema_format("achievement", ACHIEVEMENT_SCHEMA),
+                speculative=True
+            ))
+            return Achievement(
+                emoji=result["emoji"].strip(),
+                title=result["title"].strip().upper(),
+                description=result["description"].strip()
+            )
         except Exception:
-            pass
+            return None
 
-        return None
+    def _tagline_prompt(self, name: str) -> str:
+        """Build the tagline prompt for a participant."""
+        return f"""{self._participant_context(name)}{TAGLINE_TASK}
+
+Tagline for {name}:"""
 
     def generate_tagline(self, name: str) -> str:
         """Generate a witty tagline for a participant."""
+        if name in self._taglines:
+            return self._taglines[name]
+
         stats = self.analytics.participant_stats.get(name)
         if not stats:
             return "Mystery Member"
 
         # Quick LLM call for tagline
-        messages = self.chat.messages_by_sender.get(name, [])
-        sample = self._sample_messages(messages, n=10)
-        messages_text = self._format_messages_for_llm(sample)
-
-        prompt = f"""Based on these messages and stats, write a SHORT witty tagline (5-8 words max) for {name}.
-
-Stats: {stats.total_messages} messages, {stats.url_count} links, {stats.emoji_count} emojis
-
-Sample messages:
-{messages_text}
-
-Tagline:"""
-
         try:
             return self.client.generate(
-                prompt,
-                system_prompt="You write punchy, memorable taglines. Think Twitter bio energy.",
+                self._tagline_prompt(name),
+                system_prompt=WRAPPED_SYSTEM_PROMPT,
                 temperature=0.9,
-                max_tokens=30
+                max_tokens=30,
+                speculative=True
             ).strip().strip('"')
         except Exception:
             return "Living their best chat life"
 
+    def generate_taglines(self, names: list[str]) -> dict[str, str]:
+        """Generate taglines for several participants in one concurrent batch.
+
+        The results are kept, so later generate_tagline() calls for these
+        names return them without another request.
+        """
+        prompts: dict[str, str] = {}
+        for name in names:
+            stats = self.analytics.participant_stats.get(name)
+            if stats and name not in self._taglines:
+                prompts[name] = self._tagline_prompt(name)
+        responses = self.client.generate_batch(
+            list(prompts.values()),
+            system_prompt=WRAPPED_SYSTEM_PROMPT,
+            temperature=0.9,
+            max_tokens=30,
+            speculative=True
+        )
+        for name, response in zip(prompts, responses):
+            if isinstance(response, Exception):
+                self._taglines[name] = "Living their best chat life"
+            else:
+                self._taglines[name] = response.strip().strip('"')
+        return {name: self.generate_tagline(name) for name in names}
+
     def generate_participant_wrapped(self, name: str) -> ParticipantWrapped:
         """Generate complete Wrapped for a participant."""
         stats = self.analytics.participant_stats.get(name)
@@ -397,11 +643,74 @@ Tagline:"""
             return ParticipantWrapped(name=name, stats=ParticipantStats(name=name))
 
         wrapped = ParticipantWrapped(name=name, stats=stats)
-        wrapped.personality_summary = self.generate_personality_summary(name)
-        wrapped.top_topics = self.generate_top_topics(name)
-        wrapped.memorable_quotes = self.find_memorable_quotes(name)
-        wrapped.achievements = self.generate_achievements(name)
-        wrapped.tagline = self.generate_tagline(name)
+
+        # The tagline comes with an LLM-written personality summary; it needs
+        # its own request only if the summary is templated or it is known already
+        separate_tagline = name in self._taglines or self._summary_profile(name) is not None
+
+        # The LLM calls are independent, so send them all at once
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            personality = pool.submit(self.generate_personality_summary, name)
+            topics = pool.submit(self.generate_top_topics, name)
+            quotes = pool.submit(self.find_memorable_quotes, name)
+            achievements = pool.submit(self.generate_achievements, name)
+            tagline = pool.submit(self.generate_tagline, name) if separate_tagline else None
+        wrapped.personality_summary = personality.result()
+        wrapped.top_topics = topics.result()
+        wrapped.memorable_quotes = quotes.result()
+        wrapped.achievements = achievements.result()
+        # Falls back to a request of its own if the summary's didn't work out
+        wrapped.tagline = tagline.result() if tagline else self.generate_tagline(name)
+
+        # Add personality profile from features if available
+        if self.features and name in self.features.personality_profiles:
+            wrapped.personality_profile = self.features.personality_profiles[name]
+
+        return wrapped
+
+    def generate_participant_wrapped_batched(self, name: str) -> ParticipantWrapped:
+        """Generate a participant's Wrapped with one structured LLM call instead of five.
+
+        The sampled messages are sent once and the model fills in every field
+        as schema-constrained JSON. Falls back to generate_participant_wrapped()
+        if the request or its output fails.
+        """
+        stats = self.analytics.participant_stats.get(name)
+        if not stats or name not in self._rows_by_sender:
+            return self.generate_participant_wrapped(name)
+
+        prompt = f"""{self._participant_context(name)}{PARTICIPANT_WRAPPED_TASK}
+
+Wrapped for {name} (JSON):"""
+
+        try:
+            result = json.loads(self.client.generate(
+                prompt,
+                system_prompt=WRAPPED_SYSTEM_PROMPT,
+                temperature=0.8,
+                max_tokens=1000,
+                response_format=PARTICIPANT_WRAPPED_SCHEMA
+            ))
+            # Keep the achievements already shown in the group ceremony, if any
+            achievements = self._achievements.get(name)
+            if achievements is None:
+                achievement = result["achievement"]
+                achievements = self._stat_achievements(name, stats) + [Achievement(
+                    emoji=achievement["emoji"].strip(),
+                    title=achievement["title"].strip().upper(),
+                    description=achievement["description"].strip()
+                )]
+            wrapped = ParticipantWrapped(
+                name=name,
+                stats=stats,
+                personality_summary=result["personality_summary"].strip(),
+                top_topics=[t.strip() for t in result["top_topics"] if t.strip()][:5],
+                memorable_quotes=[q.strip() for q in result["memorable_quotes"] if q.strip()][:5],
+                achievements=achievements[:5],
+                tagline=result["tagline"].strip().strip('"')
+            )
+        except Exception:
+            return self.generate_participant_wrapped(name)
 
         # Add personality profile from features if available
         if self.features and name in self.features.personality_profiles:
@@ -412,7 +721,7 @@ Tagline:"""
     def generate_group_vibe(self) -> str:
         """Generate overall group vibe description."""
         # Sample messages from all participants
-        sample = self._sample_messages(self.chat.messages, n=50)
+        sample = self._sample_group_messages(n=50)
         messages_text = self._format_messages_for_llm(sample)
 
         gs = self.analytics.group_stats
@@ -422,18 +731,20 @@ Group chat with {gs.total_participants} people
 Most active: {gs.most_active_day}s at {gs.most_active_hour}:00
 """
 
-        prompt = f"""Based on these group chat messages, describe the group's overall VIBE in 2-3 fun sentences. What kind of friend group is this? What energy do they bring?
-{context}
+        prompt = f"""Group stats:{context}
 Sample messages from the group:
 {messages_text}
 
+{GROUP_VIBE_TASK}
+
 Group vibe (2-3 sentences, fun and specific):"""
 
         try:
             return self.client.generate(
                 prompt,
-                system_prompt="You describe group dynamics in a fun, Spotify Wrapped style. Be specific about the vibe, not generic.",
-                temperature=0.8
+                system_prompt=WRAPPED_SYSTEM_PROMPT,
+                temperature=0.8,
+                max_tokens=200
             ).strip()
         except Exception:
             return "A legendary group chat with unmatched energy!"
@@ -441,11 +752,21 @@ Group vibe (2-3 sentences, fun and specific):"""
     def generate_group_wrapped(self, chat_name: str = "The Group Chat") -> GroupWrapped:
         """Generate complete Wrapped for the group."""
         wrapped = GroupWrapped(chat_name=chat_name)
-        wrapped.vibe_check = self.generate_group_vibe()
+
+        # The vibe and every participant's achievements are generated
+        # concurrently, along with one batch of taglines for the participant
+        # Wrappeds that follow: those whose templated personality summary
+        # won't bring one
+        templated = [name for name in self.chat.participants if self._summary_profile(name)]
+        with ThreadPoolExecutor(max_workers=self.client.max_parallel) as pool:
+            vibe = pool.submit(self.generate_group_vibe)
+            taglines = pool.submit(self.generate_taglines, templated)
+            all_achievements = list(pool.map(self.generate_achievements, self.chat.participants))
+        wrapped.vibe_check = vibe.result()
+        taglines.result()
 
         # Compile achievements ceremony
-        for name in self.chat.participants:
-            achievements = self.generate_achievements(name)
+        for name, achievements in zip(self.chat.participants, all_achievements):
             for achievement in achievements:
                 wrapped.achievements_ceremony.append((name, achievement))
 